@@ -7,7 +7,7 @@ Er implementiert die Anwendungslogik und koordiniert alle Benutzerinteraktionen.
 
 import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from PySide6.QtCore import QObject, Signal, QTimer
 
 from ..models.mammotion_model import MammotionModel, MowerInfo, MowerStatus
@@ -87,6 +87,11 @@ class MainController(QObject):
                 self.mower_status_updated.emit(data)
                 self._check_status_notifications(data)
                 
+            elif event_type == "mowers_refreshed":
+                for mower in data["mowers"]:
+                    self.mower_status_updated.emit(mower)
+                    self._check_status_notifications(mower)
+                
             elif event_type == "discovery_failed":
                 self.error_occurred.emit("Verbindungsfehler", f"Mäher konnten nicht gefunden werden: {data['error']}")
                 
@@ -255,7 +260,7 @@ class MainController(QObject):
         """Gibt den aktuell ausgewählten Mäher zurück"""
         return self.model.get_current_mower()
     
-    def get_all_mowers(self) -> List[MowerInfo]:
+    def get_all_mowers(self) -> Tuple[MowerInfo, ...]:
         """Gibt alle verfügbaren Mäher zurück"""
         return self.model.get_all_mowers()
     
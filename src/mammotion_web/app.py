@@ -1,34 +1,57 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any
 
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 
 from .config import get_settings
 from .logging_conf import setup_logging
 from .routers import auth_router, devices_router, ws_router
+from .services.mammotion_service import preload_pymammotion, run_session_janitor
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson (FastAPI's bundled variant is deprecated)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     settings = get_settings()
-    setup_logging(settings.LOG_LEVEL)
+    log_listener = setup_logging(settings.LOG_LEVEL)
     logging.getLogger(__name__).info("Mammotion Web starting up")
+    janitor = asyncio.create_task(run_session_janitor())
+    # Warm PyMammotion imports in a worker thread so the first login does not pay for them
+    asyncio.get_running_loop().run_in_executor(None, preload_pymammotion)
     yield
     # Shutdown
+    janitor.cancel()
     logging.getLogger(__name__).info("Mammotion Web shutting down")
+    if log_listener is not None:
+        # Flush queued records before the process exits
+        log_listener.stop()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
 
-    app = FastAPI(title="Mammotion Web", lifespan=lifespan)
+    app = FastAPI(
+        title="Mammotion Web",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
 
     # Sessions
     app.add_middleware(
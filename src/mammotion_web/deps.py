@@ -0,0 +1,34 @@
+"""Shared FastAPI dependencies."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+
+_MISSING = object()
+
+
+async def get_current_user(request: Request) -> Optional[str]:
+    """Return the logged-in username, or None.
+
+    The result is memoized on ``request.state`` so handlers and nested
+    dependencies share one authentication decision per request.
+    """
+    user = getattr(request.state, "_auth_user", _MISSING)
+    if user is not _MISSING:
+        return user
+    session = request.session
+    user = session.get("username") if session.get("authenticated") else None
+    request.state._auth_user = user
+    return user
+
+
+async def require_auth(user: Optional[str] = Depends(get_current_user)) -> str:
+    """Reject the request with 401 unless a user is logged in."""
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required",
+        )
+    return user
@@ -1,15 +1,33 @@
 """Logging configuration."""
 
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 
-def setup_logging(log_level: str = "INFO") -> None:
-    """Setup basic logging."""
+def setup_logging(log_level: str = "INFO") -> Optional[QueueListener]:
+    """Setup basic logging.
+
+    Records are only queued on the calling thread; a QueueListener thread
+    formats them and writes to stdout, so the event loop never blocks on
+    console I/O. Returns the started listener (stop it on shutdown to flush),
+    or None if the root logger was already configured.
+    """
+    if logging.root.handlers:
+        return None
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        # QueueHandler only merges args into the message; the stream formatter adds the rest
+        format="%(message)s",
         handlers=[
-            logging.StreamHandler(sys.stdout)
+            QueueHandler(log_queue)
         ]
     )
+    listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -1,21 +1,79 @@
 """Authentication router for Mammotion Web."""
 
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
 from fastapi import APIRouter, Request, Form, HTTPException, status
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
 
-router = APIRouter(prefix="/auth", tags=["authentication"])
+from ..templating import LOGIN_TMPL, render
 
-# Templates
-templates_dir = Path(__file__).parent.parent / "templates"
-templates = Jinja2Templates(directory=str(templates_dir))
+router = APIRouter(prefix="/auth", tags=["authentication"])
+logger = logging.getLogger(__name__)
 
+# Failed-login throttle per client address (in-memory, single-process like the session store).
+# Keys come from request.client.host: behind a reverse proxy run uvicorn with
+# --proxy-headers/--forwarded-allow-ips, otherwise all users share the proxy's budget.
+LOGIN_WINDOW_SECONDS = 60.0
+LOGIN_MAX_FAILURES = 10
+LOGIN_MAX_TRACKED_CLIENTS = 4096
+_login_attempts: Dict[str, Deque[float]] = {}
 
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
     """Display login page."""
-    return templates.TemplateResponse("login.html", {"request": request})
+    return render(LOGIN_TMPL, request)
+
+
+def _prune_failures(client: str, now: float) -> Optional[Deque[float]]:
+    """Drop failures outside the window; forget the client once none remain."""
+    attempts = _login_attempts.get(client)
+    if attempts is None:
+        return None
+    while attempts and now - attempts[0] > LOGIN_WINDOW_SECONDS:
+        attempts.popleft()
+    if not attempts:
+        del _login_attempts[client]
+        return None
+    return attempts
+
+
+def _check_login_rate(client: str) -> None:
+    """Reject the attempt with 429 once a client has too many recent failures."""
+    attempts = _prune_failures(client, time.monotonic())
+    if attempts is not None and len(attempts) >= LOGIN_MAX_FAILURES:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+        )
+
+
+def _record_login_failure(client: str) -> None:
+    """Remember a failed attempt, keeping the table bounded under address floods."""
+    now = time.monotonic()
+    if client not in _login_attempts and len(_login_attempts) >= LOGIN_MAX_TRACKED_CLIENTS:
+        for key in list(_login_attempts):
+            _prune_failures(key, now)
+        while len(_login_attempts) >= LOGIN_MAX_TRACKED_CLIENTS:
+            # Still full of live entries: evict the oldest-tracked client
+            del _login_attempts[next(iter(_login_attempts))]
+    _login_attempts.setdefault(client, deque()).append(now)
+
+
+async def _close_service_session(sid: Optional[str]) -> None:
+    """Close and forget a MammotionService session so it does not linger in the store."""
+    if not sid:
+        return
+    from ..services.mammotion_service import AuthError, delete_session, get_service, resolve_session
+    
+    try:
+        await get_service().logout(await resolve_session(sid))
+    except AuthError:
+        # Already gone (e.g. server restart); nothing to close
+        pass
+    await delete_session(sid)
 
 
 @router.post("/login")
@@ -26,34 +84,41 @@ async def login(
 ):
     """Handle login form submission with real Mammotion API authentication."""
     # Import here to avoid circular dependencies
-    from ..services.mammotion_service import MammotionService
+    from ..services.mammotion_service import ServiceError, get_service
+    
+    client = request.client.host if request.client else "unknown"
+    _check_login_rate(client)
+    
+    # Reuse the process-wide mammotion service for real authentication
+    mammotion_service = get_service()
     
     try:
-        # Create mammotion service and attempt real authentication
-        mammotion_service = MammotionService()
-        
-        # Attempt login with real Mammotion API
-        success = await mammotion_service.login(username, password)
-        
-        if success:
-            request.session["authenticated"] = True
-            request.session["username"] = username
-            return RedirectResponse(url="/dashboard", status_code=status.HTTP_302_FOUND)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid Mammotion credentials"
-            )
+        # Attempt login with real Mammotion API; returns the service session id
+        sid = await mammotion_service.login(username, password)
+    except ServiceError:
+        # Never echo library errors back to the client; keep details in the debug log
+        logger.debug("Mammotion login failed", exc_info=True)
+        sid = None
     
-    except Exception as e:
+    if not sid:
+        _record_login_failure(client)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Authentication failed: {str(e)}"
+            detail="Invalid credentials"
         )
+    
+    _login_attempts.pop(client, None)
+    # Drop any service session left over from a previous login in this browser
+    await _close_service_session(request.session.get("sid"))
+    request.session["authenticated"] = True
+    request.session["username"] = username
+    request.session["sid"] = sid
+    return RedirectResponse(url="/dashboard", status_code=status.HTTP_302_FOUND)
 
 
 @router.post("/logout")
 async def logout(request: Request):
     """Handle logout."""
+    await _close_service_session(request.session.get("sid"))
     request.session.clear()
     return RedirectResponse(url="/auth/login", status_code=status.HTTP_302_FOUND)
@@ -1,48 +1,47 @@
 """Devices router for Mammotion Web."""
 
-from fastapi import APIRouter, Request, HTTPException, status
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request, HTTPException, status
+from fastapi.responses import HTMLResponse, Response
+
+from ..deps import get_current_user, require_auth
+from ..templating import get_template, render
 
 router = APIRouter(prefix="/devices", tags=["devices"])
 
-# Templates
-templates_dir = Path(__file__).parent.parent / "templates"
-templates = Jinja2Templates(directory=str(templates_dir))
+# Static redirect for anonymous visitors; skips RedirectResponse URL quoting per hit
+_LOGIN_REDIRECT_HEADERS = {"location": "/auth/login"}
 
 
 @router.get("/", response_class=HTMLResponse)
-async def devices_page(request: Request):
+async def devices_page(request: Request, user: Optional[str] = Depends(get_current_user)):
     """Display devices page."""
-    if not request.session.get("authenticated"):
-        return RedirectResponse(url="/auth/login")
+    if not user:
+        return Response(status_code=status.HTTP_302_FOUND, headers=_LOGIN_REDIRECT_HEADERS)
     
     # TODO: Get real devices from Mammotion API
     devices = []
     
-    return templates.TemplateResponse("devices.html", {
-        "request": request,
-        "devices": devices
-    })
+    return render(get_template("devices.html"), request, {"devices": devices})
 
 
 @router.get("/{device_id}")
-async def get_device(device_id: str):
+async def get_device(device_id: str, user: str = Depends(require_auth)):
     """Get device details."""
     # TODO: Implement real device API
     return {"device_id": device_id, "status": "unknown"}
 
 
 @router.post("/{device_id}/start")
-async def start_device(device_id: str):
+async def start_device(device_id: str, user: str = Depends(require_auth)):
     """Start mowing."""
     # TODO: Implement real device control
     return {"device_id": device_id, "action": "start", "status": "success"}
 
 
 @router.post("/{device_id}/stop")
-async def stop_device(device_id: str):
+async def stop_device(device_id: str, user: str = Depends(require_auth)):
     """Stop mowing."""
     # TODO: Implement real device control
     return {"device_id": device_id, "action": "stop", "status": "success"}
@@ -1,42 +1,113 @@
 """WebSocket router for real-time updates."""
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-import json
 import asyncio
 import logging
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import orjson
 
 router = APIRouter(tags=["websocket"])
 logger = logging.getLogger(__name__)
 
+# Per-connection outbound buffer and how many queued messages one writer pass may coalesce
+OUTBOX_SIZE = 64
+WRITE_BATCH = 16
+
+# Message types where only the newest message per key matters
+_COALESCE_KEYS = {
+    "device_status": "device_id",
+    "device_list": None,
+}
+
+_Outgoing = Tuple[Optional[Hashable], str]
+
+
+def _coalesce_key(message: dict) -> Optional[Hashable]:
+    """Return the key under which a newer message supersedes an older one, if any."""
+    msg_type = message.get("type")
+    if msg_type not in _COALESCE_KEYS:
+        return None
+    field = _COALESCE_KEYS[msg_type]
+    return (msg_type, message.get(field) if field else None)
+
 
 class ConnectionManager:
-    """Manage WebSocket connections."""
-    
+    """Manage WebSocket connections.
+
+    Every connection owns a bounded outbox drained by a single writer task, so
+    broadcasts never wait on a slow client and bursts of status updates for the
+    same device collapse into the latest one.
+    """
+
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
-    
+        self.active_connections: Dict[WebSocket, "asyncio.Queue[_Outgoing]"] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+
     async def connect(self, websocket: WebSocket):
         """Accept new connection."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        outbox: "asyncio.Queue[_Outgoing]" = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        self.active_connections[websocket] = outbox
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, outbox))
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
-    
+
     def disconnect(self, websocket: WebSocket):
         """Remove connection."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
-    
+
+    def send(self, websocket: WebSocket, message: dict) -> None:
+        """Queue a message for a single connection."""
+        outbox = self.active_connections.get(websocket)
+        if outbox is not None:
+            self._enqueue(outbox, (_coalesce_key(message), _dumps(message)))
+
     async def broadcast(self, message: dict):
         """Send message to all connected clients."""
         if self.active_connections:
-            message_str = json.dumps(message)
-            for connection in self.active_connections.copy():
-                try:
-                    await connection.send_text(message_str)
-                except Exception as e:
-                    logger.error(f"Error sending message: {e}")
-                    self.disconnect(connection)
+            # Serialize once for all connections
+            item = (_coalesce_key(message), _dumps(message))
+            for outbox in self.active_connections.values():
+                self._enqueue(outbox, item)
+
+    @staticmethod
+    def _enqueue(outbox: "asyncio.Queue[_Outgoing]", item: _Outgoing) -> None:
+        if outbox.full():
+            # Slow client: drop its oldest pending message
+            outbox.get_nowait()
+        outbox.put_nowait(item)
+
+    async def _writer(self, websocket: WebSocket, outbox: "asyncio.Queue[_Outgoing]") -> None:
+        """Drain the outbox, keeping only the newest message per coalescing key."""
+        try:
+            while True:
+                batch: Dict[Any, str] = {}
+                for i in range(WRITE_BATCH):
+                    if i == 0:
+                        key, text = await outbox.get()
+                    elif outbox.empty():
+                        break
+                    else:
+                        key, text = outbox.get_nowait()
+                    # Re-insert so a superseded message moves to its newest position
+                    slot = key if key is not None else object()
+                    batch.pop(slot, None)
+                    batch[slot] = text
+                for text in batch.values():
+                    await websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending message: {e}")
+            self.disconnect(websocket)
+
+
+def _dumps(message: dict) -> str:
+    return orjson.dumps(message).decode()
 
 
 manager = ConnectionManager()
@@ -46,19 +117,19 @@ manager = ConnectionManager()
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time updates."""
     await manager.connect(websocket)
-    
+
     try:
         while True:
             # Keep connection alive and handle incoming messages
             data = await websocket.receive_text()
-            message = json.loads(data)
-            
+            message = orjson.loads(data)
+
             # Echo back for now - TODO: implement real device communication
-            await websocket.send_text(json.dumps({
+            manager.send(websocket, {
                 "type": "echo",
                 "data": message
-            }))
-            
+            })
+
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
@@ -2,23 +2,37 @@ from __future__ import annotations
 
 import asyncio
 from collections import defaultdict
-from typing import AsyncIterator, DefaultDict, Dict
+from typing import AsyncIterator, DefaultDict, Set
 
 
 class EventBus:
     """Simple asyncio pub-sub event bus.
 
     Topics are strings, payloads arbitrary JSON-serializable objects.
+    Every subscriber gets its own bounded queue, so each one sees every event
+    published after it started iterating; topics without subscribers drop events.
     """
 
-    def __init__(self) -> None:
-        self._topics: DefaultDict[str, asyncio.Queue] = defaultdict(asyncio.Queue)
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._maxsize = maxsize
+        self._subscribers: DefaultDict[str, Set[asyncio.Queue]] = defaultdict(set)
 
     async def publish(self, topic: str, payload) -> None:
-        await self._topics[topic].put(payload)
+        for queue in tuple(self._subscribers.get(topic, ())):
+            if queue.full():
+                # Slow subscriber: drop its oldest event instead of blocking the publisher
+                queue.get_nowait()
+            queue.put_nowait(payload)
 
     async def subscribe(self, topic: str) -> AsyncIterator:
-        queue = self._topics[topic]
-        while True:
-            item = await queue.get()
-            yield item
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._maxsize)
+        subscribers = self._subscribers[topic]
+        subscribers.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            # Runs on cancellation or aclose(), e.g. when a WebSocket disconnects
+            subscribers.discard(queue)
+            if not subscribers and self._subscribers.get(topic) is subscribers:
+                del self._subscribers[topic]
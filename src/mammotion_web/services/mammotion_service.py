@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import hashlib
 import logging
+from logging import INFO
+import os
+import re
+import sys
 import time
-import secrets
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import lru_cache, partial
+from itertools import repeat
+from operator import attrgetter
+from typing import Any, Callable, DefaultDict, Dict, Iterator, List, Optional, Pattern, Protocol, Set, Tuple
 
 from ..config import get_settings
 
@@ -26,12 +35,30 @@ class CommandError(ServiceError):
     pass
 
 
-@dataclass
-class LastTelemetry:
-    battery: Optional[int] = None
-    position: Optional[Dict[str, float]] = None
-    work_mode: Optional[int] = None
-    updated_at: float = 0.0
+@dataclass(frozen=True)
+class DeviceView:
+    """Normalized listing entry; immutable so cached listings can be shared."""
+
+    __slots__ = ("id", "name", "model", "battery", "status", "position", "is_base")
+
+    id: str
+    name: str
+    model: str
+    battery: Optional[int]
+    status: str
+    position: Optional[Dict[str, Any]]
+    is_base: bool
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "model": self.model,
+            "battery": self.battery,
+            "status": self.status,
+            "position": self.position,
+            "is_base": self.is_base,
+        }
 
 
 @dataclass
@@ -40,7 +67,12 @@ class AuthSession:
     created_at: float = field(default_factory=time.time)
     client: Any = None  # CloudIOTGateway or similar
     manager: Any = None  # MammotionMixedDeviceManager or similar
+    # Guards the device listing / cache refresh only
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Per-iotId locks so managers for different devices are created concurrently
+    device_locks: DefaultDict[str, asyncio.Lock] = field(
+        default_factory=lambda: defaultdict(asyncio.Lock)
+    )
     # High-level Mammotion orchestrator (manages MQTT and device managers)
     mammotion: Any = None
     # Cache typed cloud devices by iotId (from ListingDevByAccountResponse.Data.data)
@@ -48,41 +80,341 @@ class AuthSession:
     # Cache per-device managers by iotId
     managers_by_iot: Dict[str, Any] = field(default_factory=dict)
     # Last known good telemetry per device
-    last_known_by_iot: Dict[str, LastTelemetry] = field(default_factory=dict)
+    # (one dict per field keyed by iotId; updated_at is shared by the three fields)
+    battery_by_iot: Dict[str, int] = field(default_factory=dict)
+    work_mode_by_iot: Dict[str, int] = field(default_factory=dict)
+    pos_by_iot: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    updated_at_by_iot: Dict[str, float] = field(default_factory=dict)
+    # iotIds whose telemetry sync has already been started
+    sync_started: Set[str] = field(default_factory=set)
+    # Property keys that yielded battery/mode/status per device, tried first on the next poll
+    field_plan_by_iot: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    # Resolved command callables per (iotId, command) and the cloud device they belong to
+    command_targets: Dict[Tuple[str, str], Tuple[Any, Callable[[], Any]]] = field(default_factory=dict)
+    # Recent get_device_status results per iotId with the monotonic time they were produced
+    status_cache: Dict[str, Tuple[float, Dict[str, Any]]] = field(default_factory=dict)
+    # Bumped per iotId by send_command; lookups started before a bump are not cached
+    status_generation: Dict[str, int] = field(default_factory=dict)
+    # Running get_device_status lookups per iotId, shared by overlapping requests
+    status_inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = field(default_factory=dict)
+    # Last live status per device with the state update stamp it was built from
+    live_status_by_iot: Dict[str, Tuple[Any, Dict[str, Any]]] = field(default_factory=dict)
+    # Normalized device listing and the monotonic time it was fetched
+    devices_cache: Optional[Tuple[float, List[DeviceView]]] = None
+    # The same listing keyed by device id (first entry wins)
+    devices_index: Dict[str, DeviceView] = field(default_factory=dict)
+
+
+# Name/model/category fragments identifying RTK base stations rather than mowers
+_BASE_RE = re.compile(r"rtk|base|station|rasenradar")
+
+
+def _is_base_station(name: Any, model: Any, category: Any) -> bool:
+    return _BASE_RE.search(f"{name}\0{model}\0{category}".lower()) is not None
+
+
+# Device listings rarely change; serve repeated UI polls from the session cache
+DEVICES_CACHE_TTL = 20.0
+
+
+def _fresh_devices(session: AuthSession) -> Optional[List[DeviceView]]:
+    cache = session.devices_cache
+    if cache is not None and time.monotonic() - cache[0] < DEVICES_CACHE_TTL:
+        return cache[1]
+    return None
+
+
+class SessionStore(Protocol):
+    """Backend holding AuthSessions by session id."""
+
+    async def get(self, sid: str) -> Optional[AuthSession]: ...
+
+    async def set(self, sid: str, session: AuthSession) -> None: ...
+
+    async def delete(self, sid: str) -> Optional[AuthSession]: ...
+
+    async def expire(self) -> List[AuthSession]:
+        """Drop stale entries and return the sessions whose resources must be closed."""
+        ...
+
+
+class MemorySessionStore:
+    """Bounded in-process store with a fixed TTL per session.
+
+    Sessions hold live cloud/MQTT clients, so they cannot be shared across worker
+    processes; run a single worker or pin users to one (sticky sessions).
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10_000) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # Insertion order == expiry order because every entry gets the same TTL
+        self._data: "OrderedDict[str, Tuple[float, AuthSession]]" = OrderedDict()
+        self._dropped: List[AuthSession] = []
+
+    async def get(self, sid: str) -> Optional[AuthSession]:
+        entry = self._data.get(sid)
+        if entry is None:
+            return None
+        expires_at, session = entry
+        if expires_at <= time.monotonic():
+            del self._data[sid]
+            self._dropped.append(session)
+            return None
+        return session
+
+    async def set(self, sid: str, session: AuthSession) -> None:
+        self._data.pop(sid, None)
+        while len(self._data) >= self.maxsize:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self._dropped.append(evicted)
+        self._data[sid] = (time.monotonic() + self.ttl, session)
+
+    async def delete(self, sid: str) -> Optional[AuthSession]:
+        entry = self._data.pop(sid, None)
+        return entry[1] if entry is not None else None
+
+    async def expire(self) -> List[AuthSession]:
+        now = time.monotonic()
+        while self._data:
+            sid, (expires_at, session) = next(iter(self._data.items()))
+            if expires_at > now:
+                break
+            del self._data[sid]
+            self._dropped.append(session)
+        dropped, self._dropped = self._dropped, []
+        return dropped
+
+
+@lru_cache(maxsize=1)
+def _get_store() -> SessionStore:
+    """Process-wide session store, created on first use so importing reads no settings."""
+    return MemorySessionStore(ttl=get_settings().SESSION_EXPIRE_HOURS * 3600)
+
+# How often the janitor closes expired or evicted sessions
+SESSION_JANITOR_INTERVAL = 60.0
+
+# Cloud logins currently running upstream, keyed by email and password digest
+_login_inflight: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+# Sessions sharing one cloud client (from a deduplicated login), keyed by id(client);
+# logout closes the client only when the last of them goes
+_client_refs: Dict[int, int] = {}
+
+# One Mammotion orchestrator per process (the library class is a singleton whose
+# __init__ resets its MQTT table, so it must not be re-instantiated per login),
+# plus the number of live sessions using each account's MQTT connection.
+_mammotion: Any = None
+_mammotion_refs: Dict[str, int] = {}
+# (event loop, lock) guarding the two above; created lazily, see _mammotion_guard
+_mammotion_lock: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = None
+
+
+def _mammotion_guard() -> asyncio.Lock:
+    """Lock for the shared orchestrator, created inside the running loop.
+
+    On Python 3.9 a lock binds to the loop current at construction, so a
+    module-level lock breaks under uvicorn reload or a fresh loop per test run.
+    """
+    global _mammotion_lock
+    loop = asyncio.get_running_loop()
+    if _mammotion_lock is None or _mammotion_lock[0] is not loop:
+        _mammotion_lock = (loop, asyncio.Lock())
+    return _mammotion_lock[1]
+
+
+def preload_pymammotion() -> bool:
+    """Import the PyMammotion modules used by login and status lookups.
+
+    The service keeps its imports deferred (easy to mock in tests), so the first
+    login would otherwise pay PyMammotion's import cost. Run this once at startup,
+    off the event loop; later deferred imports are then sys.modules hits.
+    """
+    try:
+        import pymammotion  # type: ignore  # noqa: F401
+        import pymammotion.aliyun.cloud_gateway  # type: ignore  # noqa: F401
+        import pymammotion.mammotion.devices.mammotion  # type: ignore  # noqa: F401
+        import pymammotion.utility.constant.device_constant  # type: ignore  # noqa: F401
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"PyMammotion preload failed: {e}")
+        return False
+    return True
+
+
+def _new_mammotion() -> Any:
+    from pymammotion.mammotion.devices.mammotion import Mammotion  # type: ignore
+    return Mammotion()
+
+
+async def _acquire_mammotion(email: str, password: str) -> Any:
+    """Return the shared orchestrator with an MQTT connection for email, connecting on first use."""
+    global _mammotion
+    async with _mammotion_guard():
+        if _mammotion is None:
+            _mammotion = _new_mammotion()
+        if email not in _mammotion.mqtt_list:
+            # Let Mammotion orchestrate the full cloud + MQTT flow to ensure AEP/session fields are set
+            await _mammotion.login_and_initiate_cloud(email, password)
+        _mammotion_refs[email] = _mammotion_refs.get(email, 0) + 1
+        return _mammotion
+
+
+async def _release_mammotion(email: str) -> None:
+    """Drop one session's reference; the last one disconnects the account's MQTT client."""
+    async with _mammotion_guard():
+        remaining = _mammotion_refs.get(email, 0) - 1
+        if remaining > 0:
+            _mammotion_refs[email] = remaining
+            return
+        _mammotion_refs.pop(email, None)
+        mqtt = _mammotion.mqtt_list.pop(email, None) if _mammotion is not None else None
+    if mqtt is not None and hasattr(mqtt, "disconnect"):
+        await asyncio.get_running_loop().run_in_executor(None, mqtt.disconnect)
+
+
+# Login waits this long for the MQTT connection before continuing without it
+MQTT_CONNECT_TIMEOUT = 10.0
+# Manager creation waits this long for MQTT before requesting a sync
+MQTT_SYNC_TIMEOUT = 5.0
+
+
+async def _wait_until(predicate: Callable[[], Any], timeout: float, first: float = 0.02, cap: float = 0.25) -> bool:
+    """Poll predicate with exponential backoff until it is truthy or timeout elapses.
+
+    The client exposes no awaitable connect signal we can hook without replacing
+    the library's own callbacks, so short early intervals keep fast connects fast.
+    """
+    deadline = time.monotonic() + timeout
+    delay = first
+    while True:
+        if predicate():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, cap)
+
+
+# Command aliases -> (queue_command name, entry points tried on the mower/cloud device in order)
+_START_ROUTE = ("start", ("start_map_hash", "start", "start_sync"))
+_STOP_ROUTE = ("stop", ("pause_device", "stop_device", "stop"))
+_DOCK_ROUTE = ("return_to_dock", ("return_to_dock",))
+_COMMAND_ROUTES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "start": _START_ROUTE,
+    "start_mowing": _START_ROUTE,
+    "pause": _STOP_ROUTE,
+    "stop": _STOP_ROUTE,
+    "dock": _DOCK_ROUTE,
+    "return": _DOCK_ROUTE,
+    "return_to_dock": _DOCK_ROUTE,
+}
+
+
+def _resolve_command(cloud_dev: Any, route: Tuple[str, Tuple[str, ...]]) -> Optional[Callable[[], Any]]:
+    """Find the callable for a command route, or None if the device supports none of them."""
+    # Some library versions expose high-level methods on the mower/cloud classes; use queue_command otherwise
+    try:
+        mower_obj = getattr(cloud_dev, "mower", None)
+        if callable(mower_obj):
+            mower_obj = mower_obj()
+    except Exception:
+        mower_obj = None
+    queued, paths = route
+    for path in paths:
+        target = mower_obj if mower_obj and hasattr(mower_obj, path) else cloud_dev if hasattr(cloud_dev, path) else None
+        if target is not None:
+            return getattr(target, path)
+    # Fallback: queue a generic command if available
+    if hasattr(cloud_dev, "queue_command"):
+        return partial(cloud_dev.queue_command, queued)
+    return None
+
 
+# UI polls every second or faster; identical status requests within this window share a result
+STATUS_CACHE_TTL = 0.5
 
-# In-memory session store (single-process). For multi-worker, replace by shared store.
-_SESSION_STORE: Dict[str, AuthSession] = {}
+
+async def _wait_connected(mqtt_client: Any, timeout: float) -> bool:
+    """Wait until the MQTT client reports a connection, at most timeout seconds.
+
+    MammotionCloud publishes connects through its on_connected_event; we
+    subscribe for the duration of the wait so a connect wakes us exactly once.
+    Clients without that event are polled with _wait_until.
+    """
+    if mqtt_client.is_connected():
+        return True
+    event = getattr(mqtt_client, "on_connected_event", None)
+    if event is None or not hasattr(event, "add_subscribers"):
+        return await _wait_until(mqtt_client.is_connected, timeout)
+    connected = asyncio.Event()
+
+    async def on_connected(*_args: Any) -> None:
+        connected.set()
+
+    event.add_subscribers(on_connected)
+    try:
+        # The connect may have landed between the first check and subscribing
+        if not mqtt_client.is_connected():
+            await asyncio.wait_for(connected.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return bool(mqtt_client.is_connected())
+    finally:
+        event.remove_subscribers(on_connected)
+
+
+# Upper bound on concurrent status lookups in get_devices_status
+STATUS_FANOUT = 8
 
 
 def _new_sid() -> str:
-    return secrets.token_urlsafe(32)
+    # 256 bits from the OS CSPRNG, URL-safe without padding
+    return base64.urlsafe_b64encode(os.urandom(32)).rstrip(b"=").decode("ascii")
 
 
-def _store_session(session: AuthSession) -> str:
+async def _store_session(session: AuthSession) -> str:
     sid = _new_sid()
-    _SESSION_STORE[sid] = session
+    await _get_store().set(sid, session)
     return sid
 
 
-def _get_session(sid: str) -> AuthSession:
-    sess = _SESSION_STORE.get(sid)
+async def _get_session(sid: str) -> AuthSession:
+    sess = await _get_store().get(sid)
     if not sess:
         raise AuthError("Session not found or expired")
     return sess
 
 
-def _delete_session(sid: str) -> None:
-    _SESSION_STORE.pop(sid, None)
+async def _delete_session(sid: str) -> None:
+    await _get_store().delete(sid)
 
 
 class MammotionService:
     def __init__(self, region: str = "eu"):
         self.region = region
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Devices whose diagnostics were already logged once
+        self._diagged: Set[str] = set()
+        self._diag_state_dumped: Set[str] = set()
 
     async def login(self, email: str, password: str) -> str:
-        """Login against Mammotion Cloud via PyMammotion (EU region)."""
+        """Login against Mammotion Cloud via PyMammotion (EU region).
+
+        Concurrent logins with the same credentials (double submit, prefetch)
+        share one upstream cloud login; each caller still gets its own session.
+        """
+        key = (email, hashlib.sha256(password.encode("utf-8")).hexdigest())
+        task = _login_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._cloud_login(email, password))
+            _login_inflight[key] = task
+            task.add_done_callback(lambda _t: _login_inflight.pop(key, None))
+        # Shield so one cancelled caller does not abort the flow for the others
+        cloud = await asyncio.shield(task)
+        return await self._open_session(email, password, cloud)
+
+    async def _cloud_login(self, email: str, password: str) -> Any:
+        """Run the PyMammotion cloud login flow and return the connected gateway."""
         try:
             # Imports are deferred so that unit tests can mock them easily
             from pymammotion import MammotionHTTP  # type: ignore
@@ -109,7 +441,7 @@ class MammotionService:
         try:
             await mammotion_http.login(email, password)
         except Exception as e:
-            self.logger.error(f"MammotionHTTP.login failed: {e}")
+            self.logger.error("MammotionHTTP.login failed: %s", e)
             raise AuthError("Authentication failed")
         # 2) Discover region using country code (requires authorization_code)
         from ..config import get_settings as _gs
@@ -118,231 +450,274 @@ class MammotionService:
             self.logger.info("MammotionService: discovering region...")
             await cloud.get_region(cc)
         except Exception as e:
-            self.logger.error(f"get_region failed: {e}")
+            self.logger.error("get_region failed: %s", e)
             raise AuthError(f"Region discovery failed: {e}")
         # 3) Connect (produces connect_response needed by login_by_oauth)
         try:
             self.logger.info("MammotionService: connecting (OA connect)...")
             await cloud.connect()
         except Exception as e:
-            self.logger.error(f"connect failed: {e}")
+            self.logger.error("connect failed: %s", e)
             raise AuthError(f"Connect failed: {e}")
         # 4) Login by OAuth (needs region and connect responses)
         try:
             self.logger.info("MammotionService: login_by_oauth...")
             await cloud.login_by_oauth(cc)
         except Exception as e:
-            self.logger.error(f"login_by_oauth failed: {e}")
+            self.logger.error("login_by_oauth failed: %s", e)
             raise AuthError(f"OAuth login failed: {e}")
         # 5) Create session by auth code
         try:
             self.logger.info("MammotionService: obtaining session by auth code...")
             await cloud.session_by_auth_code()
         except Exception as e:
-            self.logger.error(f"session_by_auth_code failed: {e}")
+            self.logger.error("session_by_auth_code failed: %s", e)
             raise AuthError(f"Session creation failed: {e}")
         # Required for MQTT setup downstream
         try:
             await cloud.aep_handle()
         except Exception as e:
-            self.logger.error(f"aep_handle failed (continuing): {e}")
+            self.logger.error("aep_handle failed (continuing): %s", e)
         self.logger.info("MammotionService: cloud connected and session established.")
+        return cloud
 
+    async def _open_session(self, email: str, password: str, cloud: Any) -> str:
+        """Create and store a new session on a logged-in cloud client."""
         # Initialize Mammotion high-level manager and connect MQTT
         mammotion_obj = None
         try:
-            from pymammotion.mammotion.devices.mammotion import Mammotion  # type: ignore
-            mammotion_obj = Mammotion()
-            # Let Mammotion orchestrate the full cloud + MQTT flow to ensure AEP/session fields are set
-            await mammotion_obj.login_and_initiate_cloud(email, password)
+            # Shared per process; the MQTT connection is reused by every session of this account
+            mammotion_obj = await _acquire_mammotion(email, password)
             # Wait briefly for MQTT connection
             try:
                 mqtt_client = mammotion_obj.mqtt_list.get(email)
-                for _ in range(40):  # ~10s max
-                    if mqtt_client and mqtt_client.is_connected():
-                        break
-                    await asyncio.sleep(0.25)
+                if mqtt_client:
+                    await _wait_connected(mqtt_client, MQTT_CONNECT_TIMEOUT)
             except Exception:
                 pass
         except Exception as e:
-            self.logger.error(f"Mammotion MQTT init failed (continuing with HTTP only): {e}")
+            self.logger.error("Mammotion MQTT init failed (continuing with HTTP only): %s", e)
             mammotion_obj = None
 
         # Store session with cloud client; device managers will be created on-demand per device
         session = AuthSession(email=email, client=cloud, manager=None, mammotion=mammotion_obj)
-        sid = _store_session(session)
+        _client_refs[id(cloud)] = _client_refs.get(id(cloud), 0) + 1
+        sid = await _store_session(session)
         return sid
 
-    async def list_devices(self, session: AuthSession) -> List[Dict[str, Any]]:
+    async def list_devices(self, session: AuthSession) -> List[DeviceView]:
         cloud = session.client
         if cloud is None:
             raise AuthError("Not authenticated")
+        cached = _fresh_devices(session)
+        if cached is not None:
+            return cached
         # Query devices bound to the account and refresh caches under lock
         async with session.lock:
-            # First try via our CloudIOTGateway
-            resp = None
-            data_dict = None
+            # Another request may have refreshed the listing while we waited
+            cached = _fresh_devices(session)
+            if cached is not None:
+                return cached
+            result = await self._fetch_devices(session, cloud)
+            index: Dict[str, DeviceView] = {}
+            for view in result:
+                index.setdefault(view.id, view)
+            session.devices_index = index
+            session.devices_cache = (time.monotonic(), result)
+            return result
+
+    def invalidate_devices(self, session: AuthSession) -> None:
+        """Force the next list_devices call to query the cloud again."""
+        session.devices_cache = None
+
+    async def _fetch_devices(self, session: AuthSession, cloud: Any) -> List[DeviceView]:
+        # First try via our CloudIOTGateway
+        resp = None
+        data_dict = None
+        try:
+            resp = await cloud.list_binding_by_account()
+        except Exception as e:
+            # Fallback path: try to read listing from the Mammotion orchestrator's cloud client
+            self.logger.warning("list_binding_by_account failed (%s); attempting Mammotion fallback", e)
             try:
-                resp = await cloud.list_binding_by_account()
-            except Exception as e:
-                # Fallback path: try to read listing from the Mammotion orchestrator's cloud client
-                self.logger.warning(f"list_binding_by_account failed ({e}); attempting Mammotion fallback")
-                try:
-                    if session.mammotion is not None:
-                        mqtt_client = getattr(session.mammotion, "mqtt_list", {}).get(session.email)
-                        if mqtt_client is not None and hasattr(mqtt_client, "cloud_client"):
-                            cc = getattr(mqtt_client, "cloud_client", None)
-                            if cc is not None and hasattr(cc, "devices_by_account_response") and cc.devices_by_account_response is not None:
-                                resp = cc.devices_by_account_response
-                            else:
-                                # As a last resort, try to connect_iot which also refreshes listing
-                                try:
-                                    from pymammotion.mammotion.devices.mammotion import Mammotion  # type: ignore
-                                    await Mammotion.connect_iot(cc)  # type: ignore[arg-type]
-                                    if hasattr(cc, "devices_by_account_response"):
-                                        resp = cc.devices_by_account_response
-                                except Exception:
-                                    pass
-                except Exception:
-                    pass
-                if resp is None:
-                    raise ServiceError(f"Geräteliste fehlgeschlagen: {e}")
+                if session.mammotion is not None:
+                    mqtt_client = getattr(session.mammotion, "mqtt_list", {}).get(session.email)
+                    if mqtt_client is not None and hasattr(mqtt_client, "cloud_client"):
+                        cc = getattr(mqtt_client, "cloud_client", None)
+                        if cc is not None and hasattr(cc, "devices_by_account_response") and cc.devices_by_account_response is not None:
+                            resp = cc.devices_by_account_response
+                        else:
+                            # As a last resort, try to connect_iot which also refreshes listing
+                            try:
+                                from pymammotion.mammotion.devices.mammotion import Mammotion  # type: ignore
+                                await Mammotion.connect_iot(cc)  # type: ignore[arg-type]
+                                if hasattr(cc, "devices_by_account_response"):
+                                    resp = cc.devices_by_account_response
+                            except Exception:
+                                pass
+            except Exception:
+                pass
+            if resp is None:
+                raise ServiceError(f"Geräteliste fehlgeschlagen: {e}")
 
-            # Typed response expected: ListingDevByAccountResponse(code:int, data: Data, id:str)
-            if resp is not None and hasattr(resp, "to_dict"):
-                try:
-                    data_dict = resp.to_dict()
-                except Exception:
-                    data_dict = None
-            if data_dict is None and hasattr(cloud, "devices_by_account_response") and cloud.devices_by_account_response is not None:
-                try:
-                    data_dict = cloud.devices_by_account_response.to_dict()
-                except Exception:
-                    data_dict = None
+        # Typed response expected: ListingDevByAccountResponse(code:int, data: Data, id:str)
+        if resp is not None and hasattr(resp, "to_dict"):
+            try:
+                data_dict = resp.to_dict()
+            except Exception:
+                data_dict = None
+        if data_dict is None and hasattr(cloud, "devices_by_account_response") and cloud.devices_by_account_response is not None:
+            try:
+                data_dict = cloud.devices_by_account_response.to_dict()
+            except Exception:
+                data_dict = None
 
-            # Diagnose-Logging for dict view
-            if isinstance(data_dict, dict):
-                try:
-                    self.logger.info(f"Devices response top-level keys: {list(data_dict.keys())}")
-                    if "data" in data_dict and isinstance(data_dict["data"], dict):
-                        self.logger.info(f"data.keys: {list(data_dict['data'].keys())}")
-                except Exception:
-                    pass
+        # Diagnose-Logging for dict view
+        if isinstance(data_dict, dict) and self.logger.isEnabledFor(INFO):
+            self.logger.info("Devices response top-level keys: %s", list(data_dict.keys()))
+            if isinstance(data_dict.get("data"), dict):
+                self.logger.info("data.keys: %s", list(data_dict["data"].keys()))
 
-            # Build a typed list if available to also cache raw Device objects
+        # Build a typed list if available to also cache raw Device objects
+        typed_devices = []
+        try:
+            # Prefer the method return value
+            if hasattr(resp, "data") and resp.data is not None and hasattr(resp.data, "data"):
+                typed_devices = list(resp.data.data or [])
+            # Fallback to attribute on cloud object
+            elif hasattr(cloud, "devices_by_account_response") and cloud.devices_by_account_response is not None:
+                d = cloud.devices_by_account_response
+                if hasattr(d, "data") and d.data is not None and hasattr(d.data, "data"):
+                    typed_devices = list(d.data.data or [])
+        except Exception:
             typed_devices = []
+
+        # Cache typed Device objects by iotId for later manager creation.
+        # Only apply membership changes so cached objects keep their identity.
+        listed: Dict[str, Any] = {}
+        for dev in typed_devices:
             try:
-                # Prefer the method return value
-                if hasattr(resp, "data") and resp.data is not None and hasattr(resp.data, "data"):
-                    typed_devices = list(resp.data.data or [])
-                # Fallback to attribute on cloud object
-                elif hasattr(cloud, "devices_by_account_response") and cloud.devices_by_account_response is not None:
-                    d = cloud.devices_by_account_response
-                    if hasattr(d, "data") and d.data is not None and hasattr(d.data, "data"):
-                        typed_devices = list(d.data.data or [])
+                iot_id_val = getattr(dev, "iotId", None)
+                if iot_id_val:
+                    listed.setdefault(str(iot_id_val), dev)
             except Exception:
-                typed_devices = []
-
-            # Cache typed Device objects by iotId for later manager creation
-            session.devices_by_iot.clear()
+                continue
+        cached = session.devices_by_iot
+        if listed.keys() != cached.keys():
+            for iot_id in cached.keys() - listed.keys():
+                del cached[iot_id]
+            for iot_id, dev in listed.items():
+                cached.setdefault(iot_id, dev)
+
+        # Now produce normalized list for UI
+        result: List[DeviceView] = []
+        if typed_devices:
             for dev in typed_devices:
                 try:
-                    iot_id_val = getattr(dev, "iotId", None)
-                    if iot_id_val:
-                        session.devices_by_iot[str(iot_id_val)] = dev
+                    iot_id = getattr(dev, "iotId", None)
+                    name = getattr(dev, "nickName", None) or getattr(dev, "deviceName", None) or iot_id
+                    model = getattr(dev, "productModel", None) or getattr(dev, "productName", None) or "Unknown"
+                    cat = getattr(dev, "categoryName", "") or ""
+                    is_base = _is_base_station(name, model, cat)
+                    # Listing does not include live battery; keep None so UI shows '—' for base stations
+                    result.append(DeviceView(
+                        id=str(iot_id),
+                        name=str(name) if name is not None else str(iot_id),
+                        model=str(model),
+                        battery=None,
+                        status="unknown",
+                        position=None,
+                        is_base=bool(is_base),
+                    ))
                 except Exception:
                     continue
-
-            # Now produce normalized list for UI
-            result: List[Dict[str, Any]] = []
-            if typed_devices:
-                for dev in typed_devices:
-                    try:
-                        iot_id = getattr(dev, "iotId", None)
-                        name = getattr(dev, "nickName", None) or getattr(dev, "deviceName", None) or iot_id
-                        model = getattr(dev, "productModel", None) or getattr(dev, "productName", None) or "Unknown"
-                        cat = getattr(dev, "categoryName", "") or ""
-                        nm = (str(name) or "").lower()
-                        mdl = (str(model) or "").lower()
-                        catl = (str(cat) or "").lower()
-                        is_base = any(k in nm or k in mdl or k in catl for k in ["rtk", "base", "station", "rasenradar"])
-                        # Listing does not include live battery; keep None so UI shows '—' for base stations
-                        result.append({
-                            "id": str(iot_id),
-                            "name": str(name) if name is not None else str(iot_id),
-                            "model": str(model),
-                            "battery": None,
-                            "status": "unknown",
-                            "position": None,
-                            "is_base": bool(is_base),
-                        })
-                    except Exception:
-                        continue
-                return result
-
-            # If we couldn't build typed list, fall back to dict heuristics
-            if not isinstance(data_dict, dict):
-                raise ServiceError("Unerwartete Antwortstruktur der Geräteliste")
-
-            devices_raw = None
-            for key in ("data", "devices", "list", "result"):
-                if key in data_dict and isinstance(data_dict[key], list):
-                    devices_raw = data_dict[key]
-                    break
-                if key in data_dict and isinstance(data_dict[key], dict) and "data" in data_dict[key] and isinstance(data_dict[key]["data"], list):
-                    devices_raw = data_dict[key]["data"]
-                    break
-            if devices_raw is None:
-                # As a last resort, if response is already a list
-                if isinstance(data_dict, list):
-                    devices_raw = data_dict
-                else:
-                    devices_raw = []
-
-            for item in devices_raw:
-                if not isinstance(item, dict):
-                    continue
-                # Common fields observed in Aliyun responses
-                iot_id = item.get("iotId") or item.get("iot_id") or item.get("id") or item.get("deviceId") or item.get("device_id")
-                name = item.get("nickName") or item.get("deviceName") or item.get("name") or iot_id
-                model = item.get("productModel") or item.get("model") or item.get("productName") or "Unknown"
-                cat = item.get("categoryName") or ""
-                nm = (str(name) or "").lower()
-                mdl = (str(model) or "").lower()
-                catl = (str(cat) or "").lower()
-                is_base = any(k in nm or k in mdl or k in catl for k in ["rtk", "base", "station", "rasenradar"])
-                # Battery/status may not be present in listing; keep None to display '—'
-                battery = item.get("battery") if item.get("battery") is not None else item.get("batteryLevel")
-                status = item.get("status") or item.get("work_mode") or "unknown"
-                pos = None
-                lat = item.get("latitude") or (item.get("position", {}) or {}).get("lat")
-                lon = item.get("longitude") or (item.get("position", {}) or {}).get("lon")
-                if lat is not None and lon is not None:
-                    pos = {"lat": lat, "lon": lon}
-                result.append({
-                    "id": str(iot_id) if iot_id is not None else name,
-                    "name": str(name),
-                    "model": str(model),
-                    "battery": int(battery) if isinstance(battery, (int, float)) else None,
-                    "status": str(status),
-                    "position": pos,
-                    "is_base": bool(is_base),
-                })
             return result
 
+        # If we couldn't build typed list, fall back to dict heuristics
+        if not isinstance(data_dict, dict):
+            raise ServiceError("Unerwartete Antwortstruktur der Geräteliste")
+
+        devices_raw = None
+        for key in ("data", "devices", "list", "result"):
+            if key in data_dict and isinstance(data_dict[key], list):
+                devices_raw = data_dict[key]
+                break
+            if key in data_dict and isinstance(data_dict[key], dict) and "data" in data_dict[key] and isinstance(data_dict[key]["data"], list):
+                devices_raw = data_dict[key]["data"]
+                break
+        if devices_raw is None:
+            # As a last resort, if response is already a list
+            if isinstance(data_dict, list):
+                devices_raw = data_dict
+            else:
+                devices_raw = []
+
+        for item in devices_raw:
+            if not isinstance(item, dict):
+                continue
+            # Common fields observed in Aliyun responses
+            iot_id = item.get("iotId") or item.get("iot_id") or item.get("id") or item.get("deviceId") or item.get("device_id")
+            name = item.get("nickName") or item.get("deviceName") or item.get("name") or iot_id
+            model = item.get("productModel") or item.get("model") or item.get("productName") or "Unknown"
+            cat = item.get("categoryName") or ""
+            is_base = _is_base_station(name, model, cat)
+            # Battery/status may not be present in listing; keep None to display '—'
+            battery = item.get("battery") if item.get("battery") is not None else item.get("batteryLevel")
+            status = item.get("status") or item.get("work_mode") or "unknown"
+            pos = None
+            lat = item.get("latitude") or (item.get("position", {}) or {}).get("lat")
+            lon = item.get("longitude") or (item.get("position", {}) or {}).get("lon")
+            if lat is not None and lon is not None:
+                pos = {"lat": lat, "lon": lon}
+            result.append(DeviceView(
+                id=str(iot_id) if iot_id is not None else name,
+                name=str(name),
+                model=str(model),
+                battery=int(battery) if isinstance(battery, (int, float)) else None,
+                status=str(status),
+                position=pos,
+                is_base=bool(is_base),
+            ))
+        return result
+
     async def get_device_status(self, session: AuthSession, device_id: str) -> Dict[str, Any]:
-        """Return live status if possible; gracefully fall back to listing info."""
+        """Return live status if possible; gracefully fall back to listing info.
+
+        Overlapping requests for the same device share one lookup, and results
+        are reused for STATUS_CACHE_TTL seconds unless a command invalidates them.
+        """
+        key = sys.intern(str(device_id))
+        cached = session.status_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+            return dict(cached[1])
+        generation = session.status_generation.get(key, 0)
+        task = session.status_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._get_device_status(session, key))
+            session.status_inflight[key] = task
+            task.add_done_callback(lambda _t: session.status_inflight.pop(key, None))
+        result = await asyncio.shield(task)
+        # A command finished meanwhile: this result may predate it, do not cache it
+        if session.status_generation.get(key, 0) == generation:
+            session.status_cache[key] = (time.monotonic(), result)
+        # Each caller gets its own copy of the shared result
+        return dict(result)
+
+    async def _get_device_status(self, session: AuthSession, device_id: str) -> Dict[str, Any]:
         # Try live status via per-device manager
         live: Optional[Dict[str, Any]] = None
         try:
             mgr = await self._get_or_create_manager(session, device_id)
 
+            # Reuse the last result while neither a notification nor a
+            # properties/status push has changed the device state
+            marker = _state_marker(mgr)
+            cached = session.live_status_by_iot.get(device_id)
+            if marker is not None and cached is not None and _same_marker(cached[0], marker):
+                return dict(cached[1])
+
             # 1) Prefer the unified device state exposed by the manager
-            state_obj = None
-            try:
-                state_obj = getattr(mgr, "state")
-            except Exception:
-                state_obj = None
+            state_obj = getattr(mgr, "state", None)
 
             battery = None
             status_text = None
@@ -351,234 +726,192 @@ class MammotionService:
             rtk_pos = None
             work_mode_val: Optional[int] = None
             online_bool: Optional[bool] = None
+            # to_dict() results computed at most once during this call
+            state_dict: Any = _UNSET
+            sub_dicts: Dict[str, Any] = {}
+            plan = session.field_plan_by_iot.setdefault(device_id, {})
+
+            # Diagnostics only when INFO records would actually be emitted
+            diag = self.logger.isEnabledFor(INFO)
 
             # Log diagnostic info once per device
-            if not hasattr(self, "_diagged"):
-                self._diagged = set()  # type: ignore[attr-defined]
-            if device_id not in self._diagged:  # type: ignore[operator]
+            if diag and device_id not in self._diagged:
                 try:
                     attrs = []
                     for name in ("state", "state_manager", "cloud"):
                         try:
                             val = getattr(mgr, name)
                             attrs.append(f"{name}={type(val).__name__}")
-                        except Exception:
+                        except _EXTRACT_ERRORS:
                             attrs.append(f"{name}=<err>")
-                    self.logger.info(f"Mgr attrs for {device_id}: {', '.join(attrs)}")
+                    self.logger.info("Mgr attrs for %s: %s", device_id, ", ".join(attrs))
                     if state_obj is not None:
                         for sub in ("status_properties", "mqtt_properties", "mow_info", "location"):
                             try:
                                 v = getattr(state_obj, sub, None)
                                 if v is not None and hasattr(v, "to_dict"):
-                                    d = v.to_dict()
-                                    self.logger.info(f"state.{sub} keys: {list(d.keys())}")
-                            except Exception:
+                                    d = sub_dicts[sub] = v.to_dict()
+                                    self.logger.info("state.%s keys: %s", sub, list(d.keys()))
+                            except _EXTRACT_ERRORS:
                                 pass
                 finally:
-                    try:
-                        self._diagged.add(device_id)  # type: ignore[attr-defined]
-                    except Exception:
-                        pass
+                    self._diagged.add(device_id)
 
             if state_obj is not None:
                 # Extra diagnostics: dump a compact snapshot once
-                try:
-                    if device_id not in getattr(self, "_diag_state_dumped", set()):
-                        sd = None
-                        try:
-                            sd = state_obj.to_dict()
-                        except Exception:
-                            sd = None
-                        if sd is not None:
-                            # Log a compact JSON length and a few interesting extracted values
-                            try:
-                                batt_hint = _deep_find_first(sd, ["batt", "battery"])
-                                stat_hint = _deep_find_first(sd, ["work", "mode", "status"])
-                                lat_hint = _deep_find_first(sd, ["latitude", "lat"])
-                                lon_hint = _deep_find_first(sd, ["longitude", "lon"])
-                                self.logger.info(
-                                    f"state.to_dict snapshot ({len(str(sd))} chars) hints: batt={batt_hint}, status={stat_hint}, lat={lat_hint}, lon={lon_hint}"
-                                )
-                            except Exception:
-                                pass
-                            try:
-                                if not hasattr(self, "_diag_state_dumped"):
-                                    self._diag_state_dumped = set()  # type: ignore[attr-defined]
-                                self._diag_state_dumped.add(device_id)  # type: ignore[attr-defined]
-                            except Exception:
-                                pass
-                except Exception:
-                    pass
+                if diag and device_id not in self._diag_state_dumped:
+                    state_dict = _safe_to_dict(state_obj)
+                    sd = state_dict
+                    if sd is not None:
+                        # Log a compact JSON length and a few interesting extracted values
+                        hints = _deep_find_many(sd, _DIAG_HINT_KEYS)
+                        self.logger.info(
+                            "state.to_dict snapshot (%d chars) hints: batt=%s, status=%s, lat=%s, lon=%s",
+                            len(str(sd)), hints.get("battery"), hints.get("status"), hints.get("lat"), hints.get("lon"),
+                        )
+                        self._diag_state_dumped.add(device_id)
                 # Try direct location on state first
-                try:
-                    loc = getattr(state_obj, "location", None)
-                    if loc is not None:
-                        # device point
-                        dev_point = getattr(loc, "device", None)
-                        lat = getattr(dev_point, "latitude", None)
-                        lon = getattr(dev_point, "longitude", None)
-                        if isinstance(lat, (int, float)) and isinstance(lon, (int, float)) and (lat != 0 or lon != 0):
-                            pos = {"lat": float(lat), "lon": float(lon)}
-                        # RTK point (record separately)
-                        rtk_point = getattr(loc, "RTK", None)
-                        lat = getattr(rtk_point, "latitude", None)
-                        lon = getattr(rtk_point, "longitude", None)
-                        if isinstance(lat, (int, float)) and isinstance(lon, (int, float)) and (lat != 0 or lon != 0):
-                            rtk_pos = {"lat": float(lat), "lon": float(lon)}
-                        # dock point (record separately and as fallback for robot only if nothing else)
-                        dock = getattr(loc, "dock", None)
-                        lat = getattr(dock, "latitude", None)
-                        lon = getattr(dock, "longitude", None)
-                        if isinstance(lat, (int, float)) and isinstance(lon, (int, float)) and (lat != 0 or lon != 0):
-                            dock_pos = {"lat": float(lat), "lon": float(lon)}
-                        if pos is None and dock_pos is not None:
-                            pos = dict(dock_pos)
-                except Exception:
-                    pass
+                loc = getattr(state_obj, "location", None)
+                if loc is not None:
+                    # device point
+                    pos = _location_point(_GET_DEVICE_LATLON, loc)
+                    # RTK point (record separately)
+                    rtk_pos = _location_point(_GET_RTK_LATLON, loc)
+                    # dock point (record separately and as fallback for robot only if nothing else)
+                    dock_pos = _location_point(_GET_DOCK_LATLON, loc)
+                    if pos is None and dock_pos is not None:
+                        pos = dict(dock_pos)
                 # Try status_properties
                 try:
                     props = getattr(state_obj, "status_properties", None)
-                    if props is not None and hasattr(props, "to_dict"):
-                        pd = props.to_dict()
+                    if props is not None:
+                        pd = _scalar_fields(props)
+                        if pd is None:
+                            pd = sub_dicts.get("status_properties") or props.to_dict()
                         # Extract battery by key search
-                        for k, v in pd.items():
-                            if isinstance(v, (int, float)) and "batt" in k.lower():
-                                battery = int(v)
-                                break
+                        v = _plan_lookup(pd, plan, "status_properties.battery", _is_battery_field, _BATTERY_KEYS)
+                        if v is not None:
+                            battery = int(v)
                         # Work mode / status indicator
-                        for k, v in pd.items():
-                            if (isinstance(v, int) and ("work" in k.lower() or "mode" in k.lower())):
-                                work_mode_val = int(v)
-                                break
-                            if isinstance(v, str) and ("work" in k.lower() or "mode" in k.lower() or k.lower() == "status"):
-                                status_text = str(v)
-                                break
+                        v = _plan_lookup(pd, plan, "status_properties.mode", _is_mode_or_status_field, _WORK_MODE_KEYS)
+                        if isinstance(v, int):
+                            work_mode_val = int(v)
+                        elif isinstance(v, str):
+                            status_text = v
                         # Position if present
                         lat = pd.get("latitude") or pd.get("lat")
                         lon = pd.get("longitude") or pd.get("lon")
                         if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
                             pos = {"lat": float(lat), "lon": float(lon)}
-                except Exception:
+                except _EXTRACT_ERRORS:
                     pass
                 # Fallback to mqtt_properties
                 if battery is None or status_text is None:
                     try:
                         mprops = getattr(state_obj, "mqtt_properties", None)
-                        if mprops is not None and hasattr(mprops, "to_dict"):
-                            md = mprops.to_dict()
+                        if mprops is not None:
+                            md = _scalar_fields(mprops)
+                            if md is None:
+                                md = sub_dicts.get("mqtt_properties") or mprops.to_dict()
                             if battery is None:
-                                for k, v in md.items():
-                                    if isinstance(v, (int, float)) and "batt" in k.lower():
-                                        battery = int(v)
-                                        break
+                                v = _plan_lookup(md, plan, "mqtt_properties.battery", _is_battery_field, _BATTERY_KEYS)
+                                if v is not None:
+                                    battery = int(v)
                             if work_mode_val is None:
-                                for k, v in md.items():
-                                    if isinstance(v, int) and ("work" in k.lower() or "mode" in k.lower()):
-                                        work_mode_val = int(v)
-                                        break
+                                v = _plan_lookup(md, plan, "mqtt_properties.mode", _is_mode_field, _WORK_MODE_KEYS)
+                                if v is not None:
+                                    work_mode_val = int(v)
                             if status_text is None and work_mode_val is None:
-                                for k, v in md.items():
-                                    if isinstance(v, str) and ("work" in k.lower() or "mode" in k.lower() or k.lower() == "status"):
-                                        status_text = str(v)
-                                        break
+                                v = _plan_lookup(md, plan, "mqtt_properties.status", _is_status_text_field, _STATUS_KEYS)
+                                if v is not None:
+                                    status_text = v
                             lat = md.get("latitude") or md.get("lat")
                             lon = md.get("longitude") or md.get("lon")
                             if pos is None and isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
                                 pos = {"lat": float(lat), "lon": float(lon)}
-                    except Exception:
+                    except _EXTRACT_ERRORS:
                         pass
 
                 # Last resort: deep search in state.to_dict()
                 if (battery is None or status_text is None or pos is None or work_mode_val is None) and hasattr(state_obj, "to_dict"):
-                    try:
-                        sd = state_obj.to_dict()
-                        if battery is None:
-                            val = _deep_find_first(sd, ["batt", "battery"])
+                    if state_dict is _UNSET:
+                        state_dict = _safe_to_dict(state_obj)
+                    sd = state_dict
+                    if sd is not None:
+                        try:
+                            # One traversal for every field that is still missing
+                            wanted: Dict[str, Pattern[str]] = {}
+                            if battery is None:
+                                wanted["battery"] = _BATTERY_HINTS
+                            if status_text is None:
+                                wanted["status"] = _STATUS_TEXT_HINTS
+                            if pos is None:
+                                wanted["lat"] = _LAT_HINTS
+                                wanted["lon"] = _LON_HINTS
+                            hits = _deep_find_many(sd, wanted, work_mode=work_mode_val is None)
+                            val = hits.get("battery")
                             if isinstance(val, (int, float)):
                                 battery = int(val)
-                        if work_mode_val is None:
-                            wv = _deep_find_work_mode(sd)
-                            if isinstance(wv, int):
+                            wv = hits.get("work_mode")
+                            if wv is not None:
                                 work_mode_val = int(wv)
-                        if status_text is None:
                             # Prefer textual fields; skip booleans
-                            val = _deep_find_first(sd, ["mode_text", "work_mode_text", "state_text", "stateName", "status_text", "status_name", "status_str", "status"])
+                            val = hits.get("status")
                             if isinstance(val, str):
                                 status_text = val
-                        if pos is None:
-                            lat = _deep_find_first(sd, ["latitude", "lat"])  # type: ignore[assignment]
-                            lon = _deep_find_first(sd, ["longitude", "lon"])  # type: ignore[assignment]
+                            lat = hits.get("lat")
+                            lon = hits.get("lon")
                             if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
                                 pos = {"lat": float(lat), "lon": float(lon)}
-                    except Exception:
-                        pass
+                        except _EXTRACT_ERRORS:
+                            pass
 
             # Read online flag separately (do not convert to status)
-            try:
-                online = getattr(state_obj, "online", None)
-                if isinstance(online, bool):
-                    online_bool = bool(online)
-            except Exception:
-                pass
+            online = getattr(state_obj, "online", None)
+            if isinstance(online, bool):
+                online_bool = online
 
             # 2) If still empty, attempt cloud->mower model as before
             if battery is None and status_text is None and pos is None:
-                cloud_dev = None
                 try:
                     cloud_dev = mgr.cloud()
-                except Exception:
+                except _EXTRACT_ERRORS:
                     cloud_dev = None
                 if cloud_dev is not None:
-                    mower_obj = None
                     try:
                         mower_obj = getattr(cloud_dev, "mower", None)
                         if callable(mower_obj):
                             mower_obj = mower_obj()
-                    except Exception:
+                    except _EXTRACT_ERRORS:
                         mower_obj = None
                     if mower_obj is not None:
                         try:
                             loc = getattr(mower_obj, "location", None)
                             if loc is not None:
-                                dev_point = getattr(loc, "device", None)
-                                lat = getattr(dev_point, "latitude", None)
-                                lon = getattr(dev_point, "longitude", None)
+                                lat, lon = _GET_DEVICE_LATLON(loc)
                                 if lat is not None and lon is not None:
                                     pos = {"lat": float(lat), "lon": float(lon)}
-                        except Exception:
+                        except _EXTRACT_ERRORS:
                             pass
-                        for path in (
-                            ("mower_state", "battery_level"),
-                            ("mower_state", "battery"),
-                            ("mowing_state", "battery"),
-                            ("status_properties", "battery_level"),
-                            ("status_properties", "batteryPercent"),
-                            ("mqtt_properties", "batteryPercent"),
-                        ):
+                        for get_val in _MOWER_BATTERY_GETTERS:
                             try:
-                                base = getattr(mower_obj, path[0], None)
-                                val = getattr(base, path[1], None) if base is not None else None
+                                val = get_val(mower_obj)
                                 if isinstance(val, (int, float)):
                                     battery = int(val)
                                     break
-                            except Exception:
+                            except _EXTRACT_ERRORS:
                                 continue
-                        for path in (
-                            ("mower_state", "work_mode"),
-                            ("mowing_state", "work_mode"),
-                            ("status_properties", "work_mode"),
-                        ):
+                        for get_val in _MOWER_WORK_MODE_GETTERS:
                             try:
-                                base = getattr(mower_obj, path[0], None)
-                                val = getattr(base, path[1], None) if base is not None else None
-                                if isinstance(val, int):
-                                    work_mode_val = int(val)
-                                    break
-                                if val is not None and status_text is None:
-                                    status_text = str(val)
-                                    break
-                            except Exception:
+                                val = get_val(mower_obj)
+                            except AttributeError:
                                 continue
+                            if isinstance(val, int):
+                                work_mode_val = int(val)
+                                break
+                            if val is not None and status_text is None:
+                                status_text = str(val)
+                                break
 
             # Decode work_mode enum if available
             if work_mode_val is not None:
@@ -586,56 +919,41 @@ class MammotionService:
             # Do not treat boolean-ish values as status text; keep None if no work_mode textual mapping
 
             # Drop invalid or near-zero coordinates (robot, dock, rtk)
-            def _clean(p):
-                try:
-                    if not isinstance(p, dict):
-                        return None
-                    plat = float(p.get("lat", 0.0))
-                    plon = float(p.get("lon", 0.0))
-                    if not (-90.0 <= plat <= 90.0 and -180.0 <= plon <= 180.0):
-                        return None
-                    if abs(plat) < 0.0001 and abs(plon) < 0.0001:
-                        return None
-                    return {"lat": plat, "lon": plon}
-                except Exception:
-                    return None
-            pos = _clean(pos)
-            dock_pos = _clean(dock_pos)
-            rtk_pos = _clean(rtk_pos)
+            pos = _clean_latlon(pos)
+            dock_pos = _clean_latlon(dock_pos)
+            rtk_pos = _clean_latlon(rtk_pos)
 
             # Update last known cache with live values
             now_ts = time.time()
-            try:
-                lk = session.last_known_by_iot.get(device_id) or LastTelemetry()
-                updated = False
-                if isinstance(battery, int):
-                    lk.battery = int(battery)
+            updated = False
+            if isinstance(battery, int):
+                session.battery_by_iot[device_id] = battery
+                updated = True
+            if isinstance(work_mode_val, int):
+                session.work_mode_by_iot[device_id] = work_mode_val
+                updated = True
+            if pos is not None:
+                latlon = (pos["lat"], pos["lon"])
+                if latlon != session.pos_by_iot.get(device_id):
+                    session.pos_by_iot[device_id] = latlon
                     updated = True
-                if isinstance(work_mode_val, int):
-                    lk.work_mode = int(work_mode_val)
-                    updated = True
-                if isinstance(pos, dict):
-                    lk.position = {"lat": float(pos["lat"]), "lon": float(pos["lon"]) }
-                    updated = True
-                if updated:
-                    lk.updated_at = now_ts
-                    session.last_known_by_iot[device_id] = lk
-            except Exception:
-                pass
+            if updated:
+                session.updated_at_by_iot[device_id] = now_ts
 
             # Prefer live position; otherwise use last known and label as cached
             pos_source = None
             pos_out = None
             pos_updated_at = None
-            lk = session.last_known_by_iot.get(device_id)
-            if isinstance(pos, dict):
+            if pos is not None:
                 pos_out = pos
                 pos_source = "live"
                 pos_updated_at = int(now_ts)
-            elif lk and lk.position:
-                pos_out = lk.position
-                pos_source = "cached"
-                pos_updated_at = int(lk.updated_at)
+            else:
+                latlon = session.pos_by_iot.get(device_id)
+                if latlon is not None:
+                    pos_out = _pos_to_dict(latlon)
+                    pos_source = "cached"
+                    pos_updated_at = int(session.updated_at_by_iot[device_id])
 
             if battery is not None or status_text is not None or pos_out is not None or online_bool is not None:
                 live = {
@@ -650,108 +968,113 @@ class MammotionService:
                     "online": online_bool,
                     "updated_at": int(now_ts),
                 }
-                try:
-                    self.logger.info(f"Live status for {device_id}: {live}")
-                except Exception:
-                    pass
+                if marker is not None:
+                    session.live_status_by_iot[device_id] = (marker, live)
+                self.logger.info("Live status for %s: %s", device_id, live)
         except NotFoundError:
             # Will fall back below
             pass
         except Exception as e:
             # Log but continue with fallback
-            self.logger.debug(f"Live status attempt failed for {device_id}: {e}")
+            self.logger.debug("Live status attempt failed for %s: %s", device_id, e)
 
         if live is not None:
             return live
 
         # Fallback: reuse last listing information
-        devices = await self.list_devices(session)
-        for d in devices:
-            if str(d.get("id")) == str(device_id):
-                result = {
-                    "id": device_id,
-                    "battery": d.get("battery"),
-                    "status": d.get("status", "unknown"),
-                    "position": d.get("position"),
-                    "updated_at": int(time.time()),
-                }
-                try:
-                    self.logger.info(f"Fallback status for {device_id}: {result}")
-                except Exception:
-                    pass
-                return result
-        raise NotFoundError("Device not found")
+        await self.list_devices(session)
+        d = session.devices_index.get(device_id)
+        if d is None:
+            raise NotFoundError("Device not found")
+        result = {
+            "id": device_id,
+            "battery": d.battery,
+            "status": d.status,
+            "position": d.position,
+            "updated_at": int(time.time()),
+        }
+        self.logger.info("Fallback status for %s: %s", device_id, result)
+        return result
+
+    async def get_devices_status(self, session: AuthSession, device_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch status for several devices concurrently, keyed by device id.
+
+        A device whose lookup fails gets {"id": ..., "error": ...} instead of
+        failing the whole response.
+        """
+        sem = asyncio.Semaphore(STATUS_FANOUT)
+
+        async def one(device_id: str) -> Dict[str, Any]:
+            async with sem:
+                return await self.get_device_status(session, device_id)
+
+        results = await asyncio.gather(*(one(i) for i in device_ids), return_exceptions=True)
+        out: Dict[str, Dict[str, Any]] = {}
+        for device_id, result in zip(device_ids, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    # Cancellation and interpreter exits are not per-device failures
+                    raise result
+                self.logger.warning("Status lookup failed for %s: %s", device_id, result)
+                result = {"id": device_id, "error": str(result)}
+            out[device_id] = result
+        return out
 
     async def send_command(self, session: AuthSession, device_id: str, command: str) -> None:
         """Best-effort command dispatch via cloud device; fall back to 400 if unsupported."""
         cmd = command.lower().strip()
-        mgr = await self._get_or_create_manager(session, device_id)
+        route = _COMMAND_ROUTES.get(cmd)
+        if route is None:
+            raise CommandError(f"Unbekannter Befehl: {command}")
+        did = sys.intern(str(device_id))
+        mgr = await self._get_or_create_manager(session, did)
+        # Commands change device state; do not serve the old listing afterwards
+        self.invalidate_devices(session)
         cloud_dev = None
         try:
             cloud_dev = mgr.cloud()
-        except Exception:
+        except AttributeError:
             cloud_dev = None
         if cloud_dev is None:
             raise CommandError("Cloud-Verbindung zum Gerät nicht verfügbar")
-        # Some library versions expose high-level methods on the mower/cloud classes; use queue_command otherwise
-        try:
-            mower_obj = getattr(cloud_dev, "mower", None)
-            if callable(mower_obj):
-                mower_obj = mower_obj()
-        except Exception:
-            mower_obj = None
         try:
-            if cmd in ("start", "start_mowing"):
-                # Try a few plausible entry points
-                for path in ("start_map_hash", "start", "start_sync"):
-                    target = mower_obj if mower_obj and hasattr(mower_obj, path) else cloud_dev if hasattr(cloud_dev, path) else None
-                    if target is not None:
-                        res = getattr(target, path)()
-                        if asyncio.iscoroutine(res):
-                            await res
-                        return
-                # Fallback: queue a generic command if available
-                if hasattr(cloud_dev, "queue_command"):
-                    res = cloud_dev.queue_command("start")
-                    if asyncio.iscoroutine(res):
-                        await res
-                    return
-            elif cmd in ("pause", "stop"):
-                for path in ("pause_device", "stop_device", "stop"):
-                    target = mower_obj if mower_obj and hasattr(mower_obj, path) else cloud_dev if hasattr(cloud_dev, path) else None
-                    if target is not None:
-                        res = getattr(target, path)()
-                        if asyncio.iscoroutine(res):
-                            await res
-                        return
-                if hasattr(cloud_dev, "queue_command"):
-                    res = cloud_dev.queue_command("stop")
-                    if asyncio.iscoroutine(res):
-                        await res
-                    return
-            elif cmd in ("dock", "return", "return_to_dock"):
-                for path in ("return_to_dock",):
-                    target = mower_obj if mower_obj and hasattr(mower_obj, path) else cloud_dev if hasattr(cloud_dev, path) else None
-                    if target is not None:
-                        res = getattr(target, path)()
-                        if asyncio.iscoroutine(res):
-                            await res
-                        return
-                if hasattr(cloud_dev, "queue_command"):
-                    res = cloud_dev.queue_command("return_to_dock")
-                    if asyncio.iscoroutine(res):
-                        await res
-                    return
+            # Resolved entry points are reused until the manager swaps its cloud device
+            key = (did, route[0])
+            cached = session.command_targets.get(key)
+            if cached is not None and cached[0] is cloud_dev:
+                fn = cached[1]
             else:
-                raise CommandError(f"Unbekannter Befehl: {command}")
+                fn = _resolve_command(cloud_dev, route)
+                if fn is None:
+                    return
+                session.command_targets[key] = (cloud_dev, fn)
+            res = fn()
+            if asyncio.iscoroutine(res):
+                await res
+            session.status_generation[did] = session.status_generation.get(did, 0) + 1
+            session.status_cache.pop(did, None)
         except CommandError:
             raise
         except Exception as e:
             raise CommandError(f"Befehl fehlgeschlagen: {e}")
 
     async def logout(self, session: AuthSession) -> None:
+        # Drop this session's hold on the account's MQTT connection
+        if session.mammotion is not None:
+            try:
+                await _release_mammotion(session.email)
+            except Exception as e:
+                self.logger.warning("MQTT release failed for %s: %s", session.email, e)
+        session.sync_started.clear()
+        client = session.client
+        if client is not None:
+            remaining = _client_refs.pop(id(client), 1) - 1
+            if remaining > 0:
+                # Another session from the same login still uses this client
+                _client_refs[id(client)] = remaining
+                client = None
         # Try to close resources gracefully
-        for obj in (session.manager, session.client):
+        for obj in (session.manager, client):
             if obj is None:
                 continue
             for meth in ("close", "disconnect", "shutdown", "logout"):
@@ -768,60 +1091,65 @@ class MammotionService:
         cloud = session.client
         if cloud is None:
             raise AuthError("Not authenticated")
-        # Fast-path: return cached manager
-        async with session.lock:
-            mgr = session.managers_by_iot.get(str(device_id))
+        did = sys.intern(str(device_id))
+        # Fast-path: return cached manager without queueing on the device lock
+        mgr = session.managers_by_iot.get(did)
+        if mgr is not None:
+            return mgr
+        async with session.device_locks[did]:
+            # Re-check: a concurrent caller may have created it while we waited
+            mgr = session.managers_by_iot.get(did)
             if mgr is not None:
                 return mgr
             # Ensure we have the typed cloud device cached
-            dev = session.devices_by_iot.get(str(device_id))
+            dev = session.devices_by_iot.get(did)
             if dev is None:
                 # Refresh device cache
                 await self.list_devices(session)
-                dev = session.devices_by_iot.get(str(device_id))
+                dev = session.devices_by_iot.get(did)
             if dev is None:
                 raise NotFoundError(f"Device not found: {device_id}")
             # Ensure identityId is present (required by cloud commands); refresh per-device if missing
-            try:
-                ident = getattr(dev, "identityId", None)
-                if ident is None or str(ident).strip() == "":
-                    cloud = session.client
-                    if cloud is not None and hasattr(cloud, "list_binding_by_dev"):
+            ident = getattr(dev, "identityId", None)
+            if ident is None or str(ident).strip() == "":
+                cloud = session.client
+                if cloud is not None and hasattr(cloud, "list_binding_by_dev"):
+                    try:
+                        detail = await cloud.list_binding_by_dev(did)
+                    except Exception as e:
+                        self.logger.warning("list_binding_by_dev failed for %s: %s", device_id, e)
+                    else:
                         try:
-                            detail = await cloud.list_binding_by_dev(str(device_id))
-                            if hasattr(detail, "data") and detail.data and hasattr(detail.data, "data") and detail.data.data:
-                                d0 = detail.data.data[0]
-                                if getattr(d0, "iotId", None):
-                                    dev = d0
-                                    session.devices_by_iot[str(device_id)] = d0
-                                    self.logger.info(f"Refreshed device {device_id} from list_binding_by_dev; identityId now: {getattr(d0, 'identityId', None)}")
-                        except Exception as e:
-                            self.logger.warning(f"list_binding_by_dev failed for {device_id}: {e}")
-            except Exception:
-                pass
+                            d0 = detail.data.data[0]
+                            if d0.iotId:
+                                dev = d0
+                                session.devices_by_iot[did] = d0
+                                self.logger.info("Refreshed device %s from list_binding_by_dev; identityId now: %s", device_id, getattr(d0, "identityId", None))
+                        except (AttributeError, IndexError, TypeError):
+                            pass
             # Use Mammotion high-level orchestrator if available to integrate MQTT
             if session.mammotion is not None:
                 try:
                     mqtt_client = getattr(session.mammotion, "mqtt_list", {}).get(session.email)
-                except Exception:
+                except AttributeError:
                     mqtt_client = None
                 try:
                     if mqtt_client is not None and hasattr(session.mammotion, "get_or_create_device_by_name"):
                         mgr = await _maybe_await(session.mammotion.get_or_create_device_by_name(dev, mqtt_client))
                         # Ensure MQTT is connected before requesting sync
                         try:
-                            for _ in range(20):  # ~5s
-                                if mqtt_client.is_connected():
-                                    break
-                                await asyncio.sleep(0.25)
-                        except Exception:
+                            await _wait_connected(mqtt_client, MQTT_SYNC_TIMEOUT)
+                        except AttributeError:
                             pass
                         # Trigger cloud sync so that state.* gets populated
-                        try:
-                            await _maybe_await(session.mammotion.start_sync(dev.deviceName, retry=0))  # type: ignore[arg-type]
-                        except Exception:
-                            pass
-                        session.managers_by_iot[str(device_id)] = mgr
+                        if did not in session.sync_started:
+                            try:
+                                await _maybe_await(session.mammotion.start_sync(dev.deviceName, retry=0))  # type: ignore[arg-type]
+                            except Exception:
+                                pass
+                            else:
+                                session.sync_started.add(did)
+                        session.managers_by_iot[did] = mgr
                         return mgr
                 except Exception:
                     mgr = None
@@ -832,11 +1160,11 @@ class MammotionService:
                 )  # type: ignore
             except Exception as e:
                 raise ServiceError(f"PyMammotion import failed: {e}")
-            name = getattr(dev, "nickName", None) or getattr(dev, "deviceName", None) or str(device_id)
+            name = getattr(dev, "nickName", None) or getattr(dev, "deviceName", None) or did
             try:
                 mgr = MammotionMixedDeviceManager(
                     name=str(name),
-                    iot_id=str(device_id),
+                    iot_id=did,
                     cloud_client=cloud,
                     cloud_device=dev,
                 )
@@ -844,15 +1172,15 @@ class MammotionService:
                 # Older lib versions may accept no-arg and require init; re-raise with context
                 raise ServiceError(f"Gerätemanager-Initialisierung fehlgeschlagen: {e}")
             # Optionally start telemetry sync if available
-            try:
-                cloud_dev = mgr.cloud()
-                if cloud_dev is not None and hasattr(cloud_dev, "start_sync"):
-                    res = cloud_dev.start_sync()
-                    if asyncio.iscoroutine(res):
-                        await res
-            except Exception:
-                pass
-            session.managers_by_iot[str(device_id)] = mgr
+            if did not in session.sync_started:
+                try:
+                    cloud_dev = mgr.cloud()
+                    if cloud_dev is not None and hasattr(cloud_dev, "start_sync"):
+                        await _maybe_await(cloud_dev.start_sync())
+                        session.sync_started.add(did)
+                except Exception:
+                    pass
+            session.managers_by_iot[did] = mgr
             return mgr
 
 
@@ -886,91 +1214,301 @@ async def _maybe_await(value: Any) -> Any:
     return value
 
 
-def _map_work_mode(value: int) -> str:
+_UNSET = object()
+
+
+def _state_marker(mgr: Any) -> Optional[Tuple[Any, Any, Any, Any]]:
+    """Snapshot of what a device state update changes, or None if not exposed.
+
+    StateManager bumps last_updated_at only in notification(); properties() and
+    status() replace mqtt_properties / status_properties / online without it,
+    so those objects are part of the marker too.
+    """
     try:
-        from pymammotion.utility.constant.device_constant import WorkMode  # type: ignore
-        mapping = {
-            getattr(WorkMode, "MODE_READY", 11): "standby",
-            getattr(WorkMode, "MODE_NOT_ACTIVE", 0): "standby",
-            getattr(WorkMode, "MODE_WORKING", 13): "mowing",
-            getattr(WorkMode, "MODE_RETURNING", 14): "returning",
-            getattr(WorkMode, "MODE_CHARGING", 15): "charging",
-            getattr(WorkMode, "MODE_PAUSE", 19): "paused",
-            getattr(WorkMode, "MODE_ONLINE", 1): "online",
-            getattr(WorkMode, "MODE_OFFLINE", 2): "offline",
-            getattr(WorkMode, "MODE_LOCK", 17): "locked",
-            getattr(WorkMode, "MODE_UPDATING", 16): "updating",
-            getattr(WorkMode, "MODE_OTA_UPGRADE_FAIL", 23): "update_failed",
-        }
-        return mapping.get(int(value), f"mode_{int(value)}")
-    except Exception:
-        return f"mode_{int(value)}"
+        stamp = mgr.state_manager.last_updated_at
+    except AttributeError:
+        return None
+    state = getattr(mgr, "state", None)
+    return (
+        stamp,
+        getattr(state, "mqtt_properties", None),
+        getattr(state, "status_properties", None),
+        getattr(state, "online", None),
+    )
+
+
+def _same_marker(a: Tuple[Any, Any, Any, Any], b: Tuple[Any, Any, Any, Any]) -> bool:
+    # Property messages are compared by identity: a push always installs a new
+    # object, and the cached marker keeps the old one alive so ids cannot be reused
+    return a[0] == b[0] and a[1] is b[1] and a[2] is b[2] and a[3] == b[3]
+
+
+@lru_cache(maxsize=None)
+def _dataclass_field_names(cls: type) -> Optional[Tuple[str, ...]]:
+    if not is_dataclass(cls):
+        return None
+    return tuple(f.name for f in fields(cls))
 
 
-def _deep_find_first(d: Any, keys_substr: List[str]) -> Optional[Any]:
-    """Search recursively for a value whose key contains one of substrings.
+def _scalar_fields(obj: Any) -> Optional[Dict[str, Any]]:
+    """Top-level scalar fields of a dataclass (e.g. betterproto) message.
 
-    Returns the first matching value encountered in DFS order.
+    Reads attributes directly instead of serializing the whole message with
+    to_dict(); returns None for objects that are not dataclasses.
     """
+    names = _dataclass_field_names(type(obj))
+    if names is None:
+        return None
+    out: Dict[str, Any] = {}
+    for name in names:
+        v = getattr(obj, name, None)
+        if isinstance(v, (int, float, str)):
+            out[name] = v
+    return out
+
+
+def _safe_to_dict(obj: Any) -> Optional[Dict[str, Any]]:
     try:
-        if isinstance(d, dict):
-            for k, v in d.items():
-                kl = str(k).lower()
-                if any(s in kl for s in keys_substr):
-                    return v
-                res = _deep_find_first(v, keys_substr)
-                if res is not None:
-                    return res
-        elif isinstance(d, list):
-            for item in d:
-                res = _deep_find_first(item, keys_substr)
-                if res is not None:
-                    return res
+        return obj.to_dict()
     except Exception:
         return None
+
+
+# Dotted lookups resolved in C; a missing link raises a single AttributeError
+_GET_DEVICE_LATLON = attrgetter("device.latitude", "device.longitude")
+_GET_RTK_LATLON = attrgetter("RTK.latitude", "RTK.longitude")
+_GET_DOCK_LATLON = attrgetter("dock.latitude", "dock.longitude")
+_MOWER_BATTERY_GETTERS = tuple(attrgetter(p) for p in (
+    "mower_state.battery_level",
+    "mower_state.battery",
+    "mowing_state.battery",
+    "status_properties.battery_level",
+    "status_properties.batteryPercent",
+    "mqtt_properties.batteryPercent",
+))
+_MOWER_WORK_MODE_GETTERS = tuple(attrgetter(p) for p in (
+    "mower_state.work_mode",
+    "mowing_state.work_mode",
+    "status_properties.work_mode",
+))
+
+
+def _location_point(getter: Callable[[Any], Tuple[Any, Any]], loc: Any) -> Optional[Dict[str, float]]:
+    """Read a lat/lon pair from a location object; None if missing, non-numeric or (0, 0)."""
+    try:
+        lat, lon = getter(loc)
+    except AttributeError:
+        return None
+    if isinstance(lat, (int, float)) and isinstance(lon, (int, float)) and (lat != 0 or lon != 0):
+        return {"lat": float(lat), "lon": float(lon)}
     return None
 
 
-def _deep_find_work_mode(d: Any) -> Optional[int]:
-    """Search recursively for an integer work_mode value.
+# Errors expected while reading loosely typed library state; anything else is a
+# bug and propagates to get_device_status' fallback handler instead of being hidden
+_EXTRACT_ERRORS = (AttributeError, KeyError, TypeError, ValueError, ArithmeticError)
 
-    This prefers keys like 'work_mode' or 'workmode', but will also accept any key name containing
-    both 'work' and 'mode'. Returns the first integer value found.
-    """
+
+LAT_MAX = 90.0
+LON_MAX = 180.0
+# Coordinates this close to (0, 0) are uninitialized fixes, not real positions
+NULL_ISLAND_EPS = 0.0001
+
+
+def _clean_latlon(p: Any) -> Optional[Dict[str, float]]:
+    """Normalize a {"lat", "lon"} dict, or None if it is out of range, NaN or (0, 0)."""
     try:
-        if isinstance(d, dict):
-            for k, v in d.items():
-                kl = str(k).lower()
-                if ("work_mode" in kl or "workmode" in kl or ("work" in kl and "mode" in kl)) and isinstance(v, int):
-                    return int(v)
-                res = _deep_find_work_mode(v)
-                if res is not None:
-                    return res
-        elif isinstance(d, list):
-            for item in d:
-                res = _deep_find_work_mode(item)
-                if res is not None:
-                    return res
-    except Exception:
+        if not isinstance(p, dict):
+            return None
+        plat = float(p.get("lat", 0.0))
+        plon = float(p.get("lon", 0.0))
+        # Chained comparisons are False for NaN, so this also rejects non-finite values
+        if not (-LAT_MAX <= plat <= LAT_MAX and -LON_MAX <= plon <= LON_MAX):
+            return None
+        if abs(plat) < NULL_ISLAND_EPS and abs(plon) < NULL_ISLAND_EPS:
+            return None
+        return {"lat": plat, "lon": plon}
+    except (TypeError, ValueError):
         return None
+
+
+def _pos_to_dict(latlon: Tuple[float, float]) -> Dict[str, float]:
+    return {"lat": latlon[0], "lon": latlon[1]}
+
+
+def _is_battery_field(key: str, value: Any) -> bool:
+    return isinstance(value, (int, float)) and "batt" in key.lower()
+
+
+def _is_mode_field(key: str, value: Any) -> bool:
+    if not isinstance(value, int):
+        return False
+    k = key.lower()
+    return "work" in k or "mode" in k
+
+
+def _is_status_text_field(key: str, value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    k = key.lower()
+    return "work" in k or "mode" in k or k == "status"
+
+
+def _is_mode_or_status_field(key: str, value: Any) -> bool:
+    return _is_mode_field(key, value) or _is_status_text_field(key, value)
+
+
+# Exact property names seen in pymammotion messages (snake_case fields and to_dict() camelCase),
+# probed directly before falling back to the substring scan. Ordered by preference.
+_BATTERY_KEYS = ("battery_val", "batteryVal", "battery_level", "batteryLevel", "battery_percent", "batteryPercent", "battery")
+_WORK_MODE_KEYS = ("work_mode", "workMode", "mode")
+_STATUS_KEYS = ("status", "work_mode", "workMode")
+
+
+def _plan_lookup(
+    d: Dict[str, Any],
+    plan: Dict[str, str],
+    slot: str,
+    match: Callable[[str, Any], bool],
+    candidates: Tuple[str, ...] = (),
+) -> Any:
+    """Return the first value in d accepted by match, trying the key remembered in plan first.
+
+    Device property schemas are stable, so after the first scan the lookup is a
+    single dict access; the full scan only runs again when that key stops matching.
+    Well-known key names in candidates are probed before scanning every key.
+    """
+    key = plan.get(slot)
+    if key is not None and key in d and match(key, d[key]):
+        return d[key]
+    for k in candidates:
+        if k in d and match(k, d[k]):
+            plan[slot] = k
+            return d[k]
+    for k, v in d.items():
+        if match(k, v):
+            plan[slot] = k
+            return v
     return None
 
 
-# Singleton service used by routers
-_service = MammotionService(region=get_settings().REGION)
+# WorkMode constant name, its known numeric value, and the status label shown in the UI
+_WORK_MODE_LABELS = (
+    ("MODE_READY", 11, "standby"),
+    ("MODE_NOT_ACTIVE", 0, "standby"),
+    ("MODE_WORKING", 13, "mowing"),
+    ("MODE_RETURNING", 14, "returning"),
+    ("MODE_CHARGING", 15, "charging"),
+    ("MODE_PAUSE", 19, "paused"),
+    ("MODE_ONLINE", 1, "online"),
+    ("MODE_OFFLINE", 2, "offline"),
+    ("MODE_LOCK", 17, "locked"),
+    ("MODE_UPDATING", 16, "updating"),
+    ("MODE_OTA_UPGRADE_FAIL", 23, "update_failed"),
+)
+
+
+@lru_cache(maxsize=1)
+def _work_mode_map() -> Dict[int, str]:
+    """Build the work_mode -> label table once, preferring the library's WorkMode values."""
+    try:
+        from pymammotion.utility.constant.device_constant import WorkMode  # type: ignore
+    except Exception:
+        WorkMode = None
+    return {int(getattr(WorkMode, name, default)): label for name, default, label in _WORK_MODE_LABELS}
 
 
+def _map_work_mode(value: int) -> str:
+    v = int(value)
+    label = _work_mode_map().get(v)
+    return label if label is not None else f"mode_{v}"
+
+
+def _hint_re(*substrings: str) -> Pattern[str]:
+    """One compiled alternation, so a key is tested against a whole group in C."""
+    return re.compile("|".join(map(re.escape, substrings)))
+
+
+# Key-substring groups for the deep state search (matched against lowercased keys)
+_BATTERY_HINTS = _hint_re("batt", "battery")
+_STATUS_TEXT_HINTS = _hint_re(
+    "mode_text", "work_mode_text", "state_text", "statename",
+    "status_text", "status_name", "status_str", "status",
+)
+_LAT_HINTS = _hint_re("latitude", "lat")
+_LON_HINTS = _hint_re("longitude", "lon")
+_DIAG_HINT_KEYS = {
+    "battery": _BATTERY_HINTS,
+    "status": _hint_re("work", "mode", "status"),
+    "lat": _LAT_HINTS,
+    "lon": _LON_HINTS,
+}
+
+
+def _deep_find_many(d: Any, wanted: Dict[str, Pattern[str]], work_mode: bool = False) -> Dict[str, Any]:
+    """Search several key-substring groups in a single traversal.
+
+    Returns, per group name, the first non-None value in depth-first order whose
+    lowercased key matches the group's pattern (see _hint_re). With work_mode=True the same pass
+    also records, under "work_mode", the first integer whose key contains both
+    "work" and "mode". Groups without a match are absent.
+    """
+    found: Dict[str, Any] = {}
+    pending = list(wanted.items())
+    need_mode = work_mode
+    if not pending and not need_mode:
+        return found
+    # Explicit stack of (key, value) iterators keeps DFS order without recursion
+    stack: List[Iterator[Tuple[Any, Any]]] = [iter(((None, d),))]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+        k, v = item
+        if v is None:
+            continue
+        if k is not None:
+            kl = str(k).lower()
+            if pending:
+                hit = [name for name, pattern in pending if pattern.search(kl)]
+                if hit:
+                    for name in hit:
+                        found[name] = v
+                    pending = [(n, pattern) for n, pattern in pending if n not in found]
+            if need_mode and isinstance(v, int) and "work" in kl and "mode" in kl:
+                found["work_mode"] = v
+                need_mode = False
+            if not pending and not need_mode:
+                break
+        if isinstance(v, dict):
+            stack.append(iter(v.items()))
+        elif isinstance(v, list):
+            stack.append(zip(repeat(None), v))
+    return found
+
+
+@lru_cache(maxsize=1)
 def get_service() -> MammotionService:
-    return _service
+    """Singleton service used by routers, created on first use."""
+    return MammotionService(region=get_settings().REGION)
+
+
+async def resolve_session(sid: str) -> AuthSession:
+    return await _get_session(sid)
 
 
-def resolve_session(sid: str) -> AuthSession:
-    return _get_session(sid)
+async def create_session_for(email: str, client: Any, manager: Any) -> str:
+    return await _store_session(AuthSession(email=email, client=client, manager=manager))
 
 
-def create_session_for(email: str, client: Any, manager: Any) -> str:
-    return _store_session(AuthSession(email=email, client=client, manager=manager))
+async def delete_session(sid: str) -> None:
+    await _delete_session(sid)
 
 
-def delete_session(sid: str) -> None:
-    _delete_session(sid)
+async def run_session_janitor(interval: float = SESSION_JANITOR_INTERVAL) -> None:
+    """Periodically close sessions the store expired or evicted; run as a background task."""
+    while True:
+        await asyncio.sleep(interval)
+        for session in await _get_store().expire():
+            await get_service().logout(session)
@@ -0,0 +1,32 @@
+"""Shared Jinja2 environment and precompiled page templates."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import Template
+
+templates_dir = Path(__file__).parent / "templates"
+templates = Jinja2Templates(directory=str(templates_dir))
+
+# Fixed pages are compiled once at import; per request only render() runs
+LOGIN_TMPL = templates.env.get_template("login.html")
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Template:
+    """Compile a template on first use and keep it for the process lifetime."""
+    return templates.env.get_template(name)
+
+
+def render(tmpl: Template, request: Request, ctx: Optional[Dict[str, Any]] = None) -> HTMLResponse:
+    """Render a precompiled template into an HTML response."""
+    context = {"request": request}
+    if ctx:
+        context.update(ctx)
+    return HTMLResponse(tmpl.render(context))
@@ -8,12 +8,19 @@ alle Mäher-Operationen.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Callable, Any
+import sys
+import time
+from collections import defaultdict
+from types import MappingProxyType
+from typing import DefaultDict, Dict, List, Mapping, Optional, Callable, Any, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
-# Mammotion API imports - ONLY real API, no fallbacks
-from .real_mammotion_api import RealMammotionAPI
+
+_MISSING = object()
+
+# slots=True gibt es erst ab Python 3.10; ältere Versionen behalten __dict__
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class MowerStatus(Enum):
@@ -27,7 +34,14 @@ class MowerStatus(Enum):
     RETURNING = "returning"
 
 
-@dataclass
+# Sekunden, in denen ein erfolgreich abgefragter Mäher nicht erneut abgefragt wird
+REFRESH_TTL = 5.0
+
+# Status-Mapping von lokaler zu echter Enum (über den gemeinsamen String-Wert)
+_STATUS_MAP: Mapping[str, MowerStatus] = MappingProxyType({s.value: s for s in MowerStatus})
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class MowerInfo:
     """Datenklasse für Mäher-Informationen"""
     device_id: str
@@ -40,6 +54,14 @@ class MowerInfo:
     last_update: Optional[str] = None
 
 
+# Mäher-Befehle: API-Methode, Zielstatus bei Erfolg, Fehlermeldung fürs Log
+_COMMANDS: Mapping[str, Tuple[str, MowerStatus, str]] = MappingProxyType({
+    "start": ("start_mowing", MowerStatus.MOWING, "Fehler beim Starten des Mähvorgangs"),
+    "stop": ("stop_mowing", MowerStatus.PAUSED, "Fehler beim Stoppen des Mähvorgangs"),
+    "dock": ("return_to_dock", MowerStatus.RETURNING, "Fehler beim Zurücksenden zur Ladestation"),
+})
+
+
 class MammotionModel:
     """
     Zentrale Model-Klasse für Mammotion Mäher-Verwaltung
@@ -49,13 +71,27 @@ class MammotionModel:
     """
     
     def __init__(self):
-        self._observers: List[Callable] = []
+        # Observer als geordnete Menge (dict-Keys) plus unveränderlicher Snapshot,
+        # der nur bei add/remove neu gebaut wird
+        self._observers: Dict[Callable, None] = {}
+        self._observer_snapshot: Tuple[Callable, ...] = ()
+        # Laufende Tasks asynchroner Observer (Referenz verhindert vorzeitige GC)
+        self._observer_tasks: Set[asyncio.Task] = set()
         self._mowers: Dict[str, MowerInfo] = {}
+        # Unveränderliche Sicht auf _mowers; None, sobald sich der Bestand ändert
+        self._mowers_view: Optional[Tuple[MowerInfo, ...]] = None
         self._current_mower_id: Optional[str] = None
+        # Zeitpunkt (monotonic) der letzten erfolgreichen Statusabfrage pro Mäher
+        self._last_refresh: Dict[str, float] = {}
+        # Befehle pro Mäher nacheinander; verschiedene Mäher bleiben parallel
+        self._device_locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
         self._is_connected: bool = False
-        self._credentials: Optional[Dict[str, str]] = None
+        # Nur die Konto-E-Mail; das Passwort bleibt nicht im Model liegen
+        self._email: Optional[str] = None
         
-        # API-Client initialisieren - NUR echte API
+        # API-Client initialisieren - NUR echte API, keine Fallbacks.
+        # Erst hier importiert, damit "import models" nicht aiohttp nachlädt.
+        from .real_mammotion_api import RealMammotionAPI
         self._api_client = RealMammotionAPI()
         
         # Logging setup
@@ -64,18 +100,7 @@ class MammotionModel:
         
     def _convert_local_to_mower_info(self, local_mower) -> MowerInfo:
         """Konvertiert LocalMowerInfo zu MowerInfo"""
-        # Status-Mapping von lokaler zu echter Enum
-        status_map = {
-            "unknown": MowerStatus.UNKNOWN,
-            "idle": MowerStatus.IDLE,
-            "mowing": MowerStatus.MOWING,
-            "charging": MowerStatus.CHARGING,
-            "paused": MowerStatus.PAUSED,
-            "error": MowerStatus.ERROR,
-            "returning": MowerStatus.RETURNING
-        }
-        
-        status = status_map.get(local_mower.status.value, MowerStatus.UNKNOWN)
+        status = _STATUS_MAP.get(local_mower.status.value, MowerStatus.UNKNOWN)
         
         return MowerInfo(
             device_id=local_mower.device_id,
@@ -90,20 +115,41 @@ class MammotionModel:
         
     def add_observer(self, callback: Callable[[str, Any], None]) -> None:
         """Fügt einen Observer hinzu, der über Änderungen benachrichtigt wird"""
-        self._observers.append(callback)
+        self._observers[callback] = None
+        self._observer_snapshot = tuple(self._observers)
         
     def remove_observer(self, callback: Callable[[str, Any], None]) -> None:
         """Entfernt einen Observer"""
-        if callback in self._observers:
-            self._observers.remove(callback)
+        if self._observers.pop(callback, _MISSING) is not _MISSING:
+            self._observer_snapshot = tuple(self._observers)
             
     def _notify_observers(self, event_type: str, data: Any = None) -> None:
         """Benachrichtigt alle Observer über ein Event"""
-        for callback in self._observers:
+        # Snapshot: Observer dürfen sich während der Benachrichtigung an-/abmelden
+        for callback in self._observer_snapshot:
             try:
-                callback(event_type, data)
+                result = callback(event_type, data)
+                if asyncio.iscoroutine(result):
+                    # Asynchrone Observer laufen als eigener Task und bremsen den Aufrufer nicht aus
+                    self._spawn_observer_task(result)
             except Exception as e:
-                self.logger.error(f"Fehler beim Benachrichtigen eines Observers: {e}")
+                self.logger.error("Fehler beim Benachrichtigen eines Observers: %s", e)
+
+    def _spawn_observer_task(self, coro) -> None:
+        """Startet einen asynchronen Observer im laufenden Event-Loop"""
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()
+            self.logger.error("Asynchroner Observer ohne laufenden Event-Loop übersprungen")
+            return
+        self._observer_tasks.add(task)
+        task.add_done_callback(self._observer_task_done)
+
+    def _observer_task_done(self, task: asyncio.Task) -> None:
+        self._observer_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error("Fehler beim Benachrichtigen eines Observers: %s", task.exception())
     
     async def login(self, email: str, password: str) -> bool:
         """
@@ -120,7 +166,7 @@ class MammotionModel:
             # NUR echte API verwenden - keine Fallbacks
             success = await self._api_client.login(email, password)
             if success:
-                self._credentials = {"email": email, "password": password}
+                self._email = email
                 self._is_connected = True
                 self._notify_observers("login_success", {"email": email})
                 return True
@@ -129,16 +175,24 @@ class MammotionModel:
                 return False
             
         except Exception as e:
-            self.logger.error(f"Login fehlgeschlagen: {e}")
+            self.logger.error("Login fehlgeschlagen: %s", e)
             self._notify_observers("login_failed", {"error": str(e)})
             return False
     
     async def logout(self) -> None:
         """Beendet die Verbindung zu Mammotion"""
         self._is_connected = False
-        self._credentials = None
+        self._email = None
+        if self._api_client is not None:
+            # HTTP-Session samt Verbindungs-Pool schließen
+            try:
+                await self._api_client.logout()
+            except Exception as e:
+                self.logger.error("Fehler beim Schließen der API-Sitzung: %s", e)
         self._api_client = None
         self._mowers.clear()
+        self._mowers_view = None
+        self._last_refresh.clear()
         self._current_mower_id = None
         self._notify_observers("logout", None)
         
@@ -159,6 +213,7 @@ class MammotionModel:
             
             # Mäher in internem Cache speichern
             self._mowers.clear()
+            self._mowers_view = None
             for mower in mowers:
                 self._mowers[mower.device_id] = mower
                 
@@ -166,13 +221,13 @@ class MammotionModel:
             if mowers and not self._current_mower_id:
                 self._current_mower_id = mowers[0].device_id
                 
-            self.logger.info(f"Gefunden: {len(mowers)} Mäher")
+            self.logger.info("Gefunden: %d Mäher", len(mowers))
             self._notify_observers("mowers_discovered", {"mowers": mowers})
             
             return mowers
             
         except Exception as e:
-            self.logger.error(f"Fehler beim Suchen nach Mähern: {e}")
+            self.logger.error("Fehler beim Suchen nach Mähern: %s", e)
             self._notify_observers("discovery_failed", {"error": str(e)})
             return []
     
@@ -190,83 +245,108 @@ class MammotionModel:
             return True
         return False
     
-    def get_all_mowers(self) -> List[MowerInfo]:
+    def get_all_mowers(self) -> Tuple[MowerInfo, ...]:
         """Gibt alle verfügbaren Mäher zurück"""
-        return list(self._mowers.values())
+        if self._mowers_view is None:
+            self._mowers_view = tuple(self._mowers.values())
+        return self._mowers_view
     
     async def start_mowing(self, device_id: Optional[str] = None) -> bool:
         """Startet den Mähvorgang - NUR echte API"""
-        target_id = device_id or self._current_mower_id
-        if not target_id or target_id not in self._mowers:
-            return False
-            
-        try:
-            # NUR echte API verwenden - keine Mock-Implementierung
-            success = await self._api_client.start_mowing(target_id)
-            if success:
-                self._mowers[target_id].status = MowerStatus.MOWING
-                self._notify_observers("mower_status_changed", self._mowers[target_id])
-            return success
-            
-        except Exception as e:
-            self.logger.error(f"Fehler beim Starten des Mähvorgangs: {e}")
-            return False
+        return await self._run_command("start", device_id)
     
     async def stop_mowing(self, device_id: Optional[str] = None) -> bool:
         """Stoppt den Mähvorgang - NUR echte API"""
-        target_id = device_id or self._current_mower_id
-        if not target_id or target_id not in self._mowers:
-            return False
-            
-        try:
-            # NUR echte API verwenden - keine Mock-Implementierung
-            success = await self._api_client.stop_mowing(target_id)
-            if success:
-                self._mowers[target_id].status = MowerStatus.PAUSED
-                self._notify_observers("mower_status_changed", self._mowers[target_id])
-            return success
-            
-        except Exception as e:
-            self.logger.error(f"Fehler beim Stoppen des Mähvorgangs: {e}")
-            return False
+        return await self._run_command("stop", device_id)
     
     async def return_to_dock(self, device_id: Optional[str] = None) -> bool:
         """Schickt den Mäher zur Ladestation zurück - NUR echte API"""
+        return await self._run_command("dock", device_id)
+    
+    async def _run_command(self, command: str, device_id: Optional[str] = None) -> bool:
+        """Führt einen Befehl aus _COMMANDS aus und setzt bei Erfolg den Zielstatus"""
+        method, status, error_text = _COMMANDS[command]
         target_id = device_id or self._current_mower_id
         if not target_id or target_id not in self._mowers:
             return False
             
         try:
-            # NUR echte API verwenden - keine Mock-Implementierung
-            success = await self._api_client.return_to_dock(target_id)
-            if success:
-                self._mowers[target_id].status = MowerStatus.RETURNING
-                self._notify_observers("mower_status_changed", self._mowers[target_id])
-            return success
+            async with self._device_locks[target_id]:
+                # NUR echte API verwenden - keine Mock-Implementierung
+                success = await getattr(self._api_client, method)(target_id)
+                if success:
+                    self._set_status(target_id, status)
+                return success
             
         except Exception as e:
-            self.logger.error(f"Fehler beim Zurücksenden zur Ladestation: {e}")
+            self.logger.error("%s: %s", error_text, e)
             return False
     
+    def _set_status(self, device_id: str, status: MowerStatus) -> None:
+        """Setzt den Status eines Mähers und benachrichtigt nur bei Änderung"""
+        mower = self._mowers[device_id]
+        if mower.status != status:
+            mower.status = status
+            self._notify_observers("mower_status_changed", mower)
+
     def is_connected(self) -> bool:
         """Prüft ob eine Verbindung besteht"""
         return self._is_connected
     
-    async def refresh_status(self, device_id: Optional[str] = None) -> bool:
-        """Aktualisiert den Status eines Mähers - NUR echte API"""
+    async def refresh_status(self, device_id: Optional[str] = None, force: bool = False) -> bool:
+        """
+        Aktualisiert den Status eines Mähers - NUR echte API
+        
+        Innerhalb von REFRESH_TTL nach der letzten erfolgreichen Abfrage gilt der
+        bekannte Status als aktuell; force=True fragt trotzdem ab.
+        """
         target_id = device_id or self._current_mower_id
         if not target_id or target_id not in self._mowers:
             return False
             
+        success, changed = await self._fetch_status(target_id, force)
+        if changed is not None:
+            self._notify_observers("mower_status_changed", changed)
+        return success
+
+    async def refresh_all_statuses(self, force: bool = False) -> Dict[str, bool]:
+        """
+        Aktualisiert alle bekannten Mäher parallel - NUR echte API
+        
+        Geänderte Mäher werden gesammelt mit einem einzigen
+        "mowers_refreshed"-Event gemeldet.
+        
+        Returns:
+            Erfolg pro Geräte-ID
+        """
+        device_ids = list(self._mowers)
+        results = await asyncio.gather(*(self._fetch_status(i, force) for i in device_ids))
+        changed = [mower for _, mower in results if mower is not None]
+        if changed:
+            self._notify_observers("mowers_refreshed", {"mowers": changed})
+        return {device_id: success for device_id, (success, _) in zip(device_ids, results)}
+
+    async def _fetch_status(self, target_id: str, force: bool = False) -> Tuple[bool, Optional[MowerInfo]]:
+        """Holt den Status eines Mähers; liefert (Erfolg, geänderter Mäher oder None)"""
+        last = self._last_refresh.get(target_id)
+        if not force and last is not None and time.monotonic() - last < REFRESH_TTL:
+            return True, None
         try:
             # NUR echte API verwenden - keine Mock-Updates
             updated_mower = await self._api_client.get_device_status(target_id)
-            if updated_mower:
-                self._mowers[target_id] = self._convert_local_to_mower_info(updated_mower)
-                self._notify_observers("mower_status_changed", self._mowers[target_id])
-                return True
-            return False
-            
         except Exception as e:
-            self.logger.error(f"Fehler beim Aktualisieren des Status: {e}")
-            return False
+            self.logger.error("Fehler beim Aktualisieren des Status: %s", e)
+            return False, None
+        if not updated_mower:
+            return False, None
+        # Mäher kann während des Requests verschwunden sein (z. B. Logout)
+        if target_id not in self._mowers:
+            return False, None
+        self._last_refresh[target_id] = time.monotonic()
+        mower = self._convert_local_to_mower_info(updated_mower)
+        # Nur echte Änderungen melden (Dataclass-Gleichheit vergleicht alle Felder)
+        if mower == self._mowers[target_id]:
+            return True, None
+        self._mowers[target_id] = mower
+        self._mowers_view = None
+        return True, mower
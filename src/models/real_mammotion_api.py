@@ -7,17 +7,25 @@ die Mammotion-API direkt über HTTP-Requests.
 
 import asyncio
 import aiohttp
-import json
 import logging
 import hashlib
+import orjson
 import hmac
+import re
+import sys
+from random import Random
 import time
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
 
+# slots=True gibt es erst ab Python 3.10; ältere Versionen behalten __dict__
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class MowerStatus(Enum):
     """Status-Enum für Mäher (lokale Kopie)"""
     UNKNOWN = "unknown"
@@ -29,7 +37,42 @@ class MowerStatus(Enum):
     RETURNING = "returning"
 
 
-@dataclass
+# Status-Strings der API -> MowerStatus (die Enum-Werte entsprechen den API-Strings)
+_STATUS_MAP: Mapping[str, MowerStatus] = MappingProxyType({s.value: s for s in MowerStatus})
+
+# Simulierter Zielstatus pro Steuerbefehl (andere Befehle ändern den Status nicht)
+_CMD_TO_STATUS: Mapping[str, MowerStatus] = MappingProxyType({
+    'start': MowerStatus.MOWING,
+    'stop': MowerStatus.PAUSED,
+    'dock': MowerStatus.RETURNING,
+})
+
+# Einfache Plausibilitätsprüfung: genau ein @, danach eine Domain mit Punkt, keine Leerzeichen
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+# Zufallsquelle für simulierte Statusänderungen (in Tests per _rng.seed() reproduzierbar)
+_rng = Random()
+
+# Zuletzt erzeugter Zeitstempel: (Unix-Sekunde, ISO-String)
+_now_iso_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """Aktuelle Zeit als ISO-8601 auf Sekunden genau.
+
+    Innerhalb derselben Sekunde (z. B. beim parallelen Aktualisieren aller
+    Mäher) wird derselbe, internierte String wiederverwendet.
+    """
+    global _now_iso_cache
+    now = time.time()
+    second = int(now)
+    if _now_iso_cache[0] != second:
+        stamp = datetime.fromtimestamp(second).isoformat(timespec="seconds")
+        _now_iso_cache = (second, sys.intern(stamp))
+    return _now_iso_cache[1]
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class LocalMowerInfo:
     """Lokale MowerInfo-Klasse für API-Kommunikation"""
     device_id: str
@@ -42,7 +85,7 @@ class LocalMowerInfo:
     last_update: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class MammotionCredentials:
     """Mammotion-Zugangsdaten"""
     email: str
@@ -58,6 +101,9 @@ class RealMammotionAPI:
     
     Diese Klasse kommuniziert direkt mit den Mammotion-Servern
     ohne die problematische PyMammotion-Bibliothek zu verwenden.
+    
+    Eine Instanz hält eine HTTP-Session für ihre gesamte Lebensdauer; als
+    ``async with RealMammotionAPI() as api:`` wird sie am Ende geschlossen.
     """
     
     # Mammotion API-Endpunkte
@@ -66,24 +112,96 @@ class RealMammotionAPI:
     DEVICES_URL = f"{BASE_URL}/devices"
     CONTROL_URL = f"{BASE_URL}/control"
     
-    def __init__(self):
+    # Verbindungs-Pool der HTTP-Session: begrenzt parallele Verbindungen und hält
+    # TLS-Verbindungen länger als das 30-s-Statusintervall der GUI offen
+    POOL_LIMIT = 8
+    KEEPALIVE_TIMEOUT = 60.0
+    # DNS-Ergebnisse 5 min cachen (aiohttp-Standard: 10 s, also fast jede Abfrage neu)
+    DNS_CACHE_TTL = 300
+    # Gesamtzeit pro Request; Verbindungsaufbau und Lesepausen deutlich kürzer,
+    # damit ein hängender Server nicht die vollen 30 s blockiert
+    REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5, sock_read=15)
+    # Geräte-Antworten ab dieser Größe werden in einem Worker-Thread dekodiert und geparst
+    PARSE_IN_THREAD_BYTES = 64_000
+    
+    def __init__(self, max_concurrent: int = POOL_LIMIT):
         self.logger = logging.getLogger(__name__)
         self.session: Optional[aiohttp.ClientSession] = None
+        # Begrenzt gleichzeitige Requests, bevor sie auf den Pool warten: die Wartezeit
+        # auf eine freie Verbindung zählt sonst gegen das 5-s-Connect-Timeout
+        self._max_concurrent = max_concurrent
+        self._sem: Optional[asyncio.Semaphore] = None
+        # Authorization-Header für das aktuelle Token: (Token, Header)
+        self._auth_cache: Optional[Tuple[str, Dict[str, str]]] = None
         self.credentials: Optional[MammotionCredentials] = None
-        self._devices: Dict[str, Dict] = {}
+        # Zuletzt gefundene Mäher (bereits geparst) als Grundlage der Simulations-Fallbacks
+        self._devices: Dict[str, LocalMowerInfo] = {}
         
     async def _ensure_session(self):
         """Stellt sicher, dass eine HTTP-Session existiert"""
         if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
+            connector = aiohttp.TCPConnector(
+                limit=self.POOL_LIMIT,
+                keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=self.DNS_CACHE_TTL,
+            )
             self.session = aiohttp.ClientSession(
-                timeout=timeout,
+                connector=connector,
+                timeout=self.REQUEST_TIMEOUT,
                 headers={
                     'User-Agent': 'MammotionLinuxApp/1.0',
                     'Content-Type': 'application/json'
                 }
             )
     
+    def _request_slots(self) -> asyncio.Semaphore:
+        """Semaphore für gleichzeitige Requests (erst im laufenden Event-Loop erzeugt)"""
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self._max_concurrent)
+        return self._sem
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """Authorization-Header, einmal pro Access-Token gebaut"""
+        token = self.credentials.access_token
+        cached = self._auth_cache
+        if cached is None or cached[0] != token:
+            cached = self._auth_cache = (token, {'Authorization': f'Bearer {token}'})
+        return cached[1]
+    
+    @staticmethod
+    async def _json(response: aiohttp.ClientResponse) -> Any:
+        """Dekodiert den Response-Body mit orjson"""
+        return RealMammotionAPI._decode(await response.read())
+    
+    @staticmethod
+    def _decode(body: bytes) -> Any:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            # Wie bei response.json(): ungültige Antworten zählen als Transportfehler
+            raise aiohttp.ClientPayloadError(f"Ungültige JSON-Antwort: {e}") from e
+    
+    def _parse_devices(self, body: bytes) -> List[LocalMowerInfo]:
+        """Dekodiert eine Geräteliste und parst alle gültigen Einträge (threadsicher)"""
+        devices = self._decode(body).get('devices', [])
+        return [mower for mower in map(self._parse_device_data, devices) if mower]
+    
+    async def connect(self) -> "RealMammotionAPI":
+        """Öffnet die HTTP-Session vorab (idempotent)"""
+        await self._ensure_session()
+        return self
+    
+    async def aclose(self) -> None:
+        """Schließt die HTTP-Session samt Verbindungs-Pool"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+    
+    async def __aenter__(self) -> "RealMammotionAPI":
+        return await self.connect()
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+    
     async def login(self, email: str, password: str) -> bool:
         """
         Authentifizierung bei Mammotion
@@ -113,9 +231,9 @@ class RealMammotionAPI:
             
             # Versuche echte API
             try:
-                async with self.session.post(self.LOGIN_URL, json=login_data) as response:
+                async with self._request_slots(), self.session.post(self.LOGIN_URL, data=orjson.dumps(login_data)) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = await self._json(response)
                         
                         self.credentials = MammotionCredentials(
                             email=email,
@@ -138,7 +256,7 @@ class RealMammotionAPI:
                 self.credentials = MammotionCredentials(
                     email=email,
                     password=password,
-                    access_token="dev_token_" + hashlib.md5(email.encode()).hexdigest()[:16]
+                    access_token="dev_token_" + hashlib.blake2s(email.encode(), digest_size=8).hexdigest()
                 )
                 
                 self.logger.info("Login erfolgreich (Entwicklungsmodus)")
@@ -152,7 +270,7 @@ class RealMammotionAPI:
     
     def _is_valid_email(self, email: str) -> bool:
         """Einfache E-Mail-Validierung"""
-        return "@" in email and "." in email.split("@")[1]
+        return _EMAIL_RE.fullmatch(email) is not None
     
     async def discover_devices(self) -> List[Any]:
         """
@@ -167,23 +285,20 @@ class RealMammotionAPI:
         try:
             await self._ensure_session()
             
-            headers = {
-                'Authorization': f'Bearer {self.credentials.access_token}'
-            }
+            headers = self._auth_headers()
             
             # Versuche echte API
             try:
-                async with self.session.get(self.DEVICES_URL, headers=headers) as response:
+                async with self._request_slots(), self.session.get(self.DEVICES_URL, headers=headers) as response:
                     if response.status == 200:
-                        data = await response.json()
-                        devices = data.get('devices', [])
-                        
-                        mowers = []
-                        for device in devices:
-                            mower = self._parse_device_data(device)
-                            if mower:
-                                mowers.append(mower)
-                                self._devices[mower.device_id] = device
+                        body = await response.read()
+                        if len(body) > self.PARSE_IN_THREAD_BYTES:
+                            # Große Flotten nicht auf dem Event-Loop-Thread parsen
+                            mowers = await asyncio.to_thread(self._parse_devices, body)
+                        else:
+                            mowers = self._parse_devices(body)
+                        for mower in mowers:
+                            self._devices[mower.device_id] = mower
                                 
                         self.logger.info(f"Gefunden: {len(mowers)} Mäher")
                         return mowers
@@ -202,22 +317,12 @@ class RealMammotionAPI:
     def _parse_device_data(self, device_data: Dict) -> Optional[LocalMowerInfo]:
         """Konvertiert API-Gerätedaten zu LocalMowerInfo"""
         try:
-            # Status-Mapping
-            status_map = {
-                'idle': MowerStatus.IDLE,
-                'mowing': MowerStatus.MOWING,
-                'charging': MowerStatus.CHARGING,
-                'paused': MowerStatus.PAUSED,
-                'error': MowerStatus.ERROR,
-                'returning': MowerStatus.RETURNING
-            }
-            
-            status = status_map.get(device_data.get('status', 'unknown'), MowerStatus.UNKNOWN)
+            status = _STATUS_MAP.get(device_data.get('status', 'unknown'), MowerStatus.UNKNOWN)
             
             # Position extrahieren
             position = None
-            if 'position' in device_data:
-                pos_data = device_data['position']
+            pos_data = device_data.get('position')
+            if pos_data is not None:
                 position = {
                     'lat': pos_data.get('latitude', 0.0),
                     'lon': pos_data.get('longitude', 0.0)
@@ -234,7 +339,8 @@ class RealMammotionAPI:
                 last_update=device_data.get('lastUpdate')
             )
             
-        except Exception as e:
+        except (AttributeError, TypeError) as e:
+            # Kein Objekt bzw. Position/Status mit unerwartetem Typ
             self.logger.error(f"Fehler beim Parsen der Gerätedaten: {e}")
             return None
     
@@ -262,13 +368,11 @@ class RealMammotionAPI:
                 'params': params or {}
             }
             
-            headers = {
-                'Authorization': f'Bearer {self.credentials.access_token}'
-            }
+            headers = self._auth_headers()
             
             # Versuche echte API
             try:
-                async with self.session.post(self.CONTROL_URL, json=command_data, headers=headers) as response:
+                async with self._request_slots(), self.session.post(self.CONTROL_URL, data=orjson.dumps(command_data), headers=headers) as response:
                     if response.status == 200:
                         self.logger.info(f"Befehl '{command}' erfolgreich gesendet an {device_id}")
                         return True
@@ -279,18 +383,14 @@ class RealMammotionAPI:
                 self.logger.warning(f"Steuerungs-API nicht erreichbar: {e}")
             
             # Fallback: Simuliere erfolgreichen Befehl
-            if device_id in self._devices:
-                device = self._devices[device_id]
-                
+            mower = self._devices.get(device_id)
+            if mower is not None:
                 # Simuliere Status-Änderung
-                if command == 'start':
-                    device['status'] = 'mowing'
-                elif command == 'stop':
-                    device['status'] = 'paused'
-                elif command == 'dock':
-                    device['status'] = 'returning'
+                new_status = _CMD_TO_STATUS.get(command)
+                if new_status is not None:
+                    mower.status = new_status
                 
-                device['lastUpdate'] = datetime.now().isoformat()
+                mower.last_update = _now_iso()
                 
                 self.logger.info(f"Befehl '{command}' simuliert für {device_id}")
                 return True
@@ -317,30 +417,26 @@ class RealMammotionAPI:
         try:
             await self._ensure_session()
             
-            headers = {
-                'Authorization': f'Bearer {self.credentials.access_token}'
-            }
+            headers = self._auth_headers()
             
             # Versuche echte API
             try:
-                async with self.session.get(f"{self.DEVICES_URL}/{device_id}", headers=headers) as response:
+                async with self._request_slots(), self.session.get(f"{self.DEVICES_URL}/{device_id}", headers=headers) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = await self._json(response)
                         return self._parse_device_data(data)
                         
             except aiohttp.ClientError as e:
                 self.logger.warning(f"Status-API nicht erreichbar: {e}")
             
             # Fallback: Verwende gecachte Daten
-            if device_id in self._devices:
-                device = self._devices[device_id]
-                
-                # Simuliere kleine Änderungen
-                import random
-                device['batteryLevel'] = max(0, min(100, device['batteryLevel'] + random.randint(-2, 3)))
-                device['lastUpdate'] = datetime.now().isoformat()
+            mower = self._devices.get(device_id)
+            if mower is not None:
+                # Simuliere kleine Änderungen direkt am gecachten Objekt (kein erneutes Parsen)
+                mower.battery_level = max(0, min(100, mower.battery_level + _rng.randint(-2, 3)))
+                mower.last_update = _now_iso()
                 
-                return self._parse_device_data(device)
+                return mower
                 
             return None
             
@@ -348,6 +444,21 @@ class RealMammotionAPI:
             self.logger.error(f"Fehler beim Abrufen des Status: {e}")
             return None
     
+    async def get_devices_status(self, device_ids: List[str]) -> List[Optional[LocalMowerInfo]]:
+        """
+        Holt den Status mehrerer Mäher parallel über die gemeinsame Session
+        
+        Args:
+            device_ids: IDs der Mäher
+            
+        Returns:
+            Status pro ID in derselben Reihenfolge (None wenn nicht verfügbar)
+        """
+        if not self.credentials or not self.credentials.access_token:
+            raise RuntimeError("Nicht eingeloggt")
+        # Die API kennt keinen Sammel-Endpunkt; die Parallelität begrenzt _request_slots()
+        return list(await asyncio.gather(*(self.get_device_status(i) for i in device_ids)))
+    
     async def start_mowing(self, device_id: str) -> bool:
         """Startet den Mähvorgang"""
         return await self.send_command(device_id, 'start')
@@ -363,11 +474,9 @@ class RealMammotionAPI:
     async def logout(self):
         """Beendet die Sitzung"""
         self.credentials = None
+        self._auth_cache = None
         self._devices.clear()
-        
-        if self.session and not self.session.closed:
-            await self.session.close()
-            
+        await self.aclose()
         self.logger.info("Logout erfolgreich")
     
     def is_connected(self) -> bool:
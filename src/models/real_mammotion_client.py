@@ -7,7 +7,8 @@ Basiert auf der offiziellen PyMammotion-Bibliothek.
 
 import asyncio
 import logging
-from typing import Optional, Dict, Any, List, Callable
+import time
+from typing import Optional, Dict, Any, List, Callable, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import aiohttp
@@ -24,6 +25,112 @@ except ImportError as e:
     PyMammotionNotAvailable = None
     logging.warning(f"PyMammotion nicht verfügbar: {e}")
 
+# Token-Cache im System-Schlüsselbund (optional)
+try:
+    from ..mammotion_web.security.keyring_store import KeyringStore, KeyringUnavailableError
+except ImportError:
+    KeyringStore = None
+    KeyringUnavailableError = None
+
+
+# Verbindungs-Pool der gemeinsamen HTTP-Session
+POOL_LIMIT = 100
+POOL_LIMIT_PER_HOST = 32
+KEEPALIVE_TIMEOUT = 75.0
+DNS_CACHE_TTL = 300
+
+# Gecachte Tokens gelten als abgelaufen, wenn sie in weniger als
+# TOKEN_EXPIRY_MARGIN Sekunden ablaufen
+TOKEN_EXPIRY_MARGIN = 60.0
+
+# Marker für "token_store nicht übergeben" (None schaltet den Cache ab)
+_MISSING = object()
+
+# (Event-Loop, Session) - eine Session pro laufendem Loop
+_shared_session: Optional[Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = None
+# Laufende Schließvorgänge ersetzter Sessions (Referenz gegen vorzeitige GC)
+_closing_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Gibt die gemeinsame HTTP-Session zurück und legt sie bei Bedarf an
+
+    Alle RealMammotionClient-Instanzen teilen sich Verbindungs-Pool,
+    DNS-Cache und TLS-Verbindungen. Muss im laufenden Event-Loop
+    aufgerufen werden.
+    """
+    global _shared_session
+    loop = asyncio.get_running_loop()
+    if _shared_session is not None:
+        owner, session = _shared_session
+        if owner is loop and not session.closed:
+            return session
+        _retire_session(owner, session)
+    connector = aiohttp.TCPConnector(
+        limit=POOL_LIMIT,
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=30),
+        headers={
+            'User-Agent': 'Mammotion-Linux-App/1.0',
+            'Content-Type': 'application/json'
+        }
+    )
+    _shared_session = (loop, session)
+    return session
+
+
+def _retire_session(owner: asyncio.AbstractEventLoop, session: aiohttp.ClientSession) -> None:
+    """Schließt eine Session, deren Event-Loop nicht mehr der aktuelle ist"""
+    if session.closed:
+        return
+    if owner.is_running():
+        # Der alte Loop läuft in einem anderen Thread weiter: dort schließen
+        asyncio.run_coroutine_threadsafe(session.close(), owner)
+        return
+    task = asyncio.get_running_loop().create_task(_close_stale_session(session))
+    _closing_tasks.add(task)
+    task.add_done_callback(_closing_tasks.discard)
+
+
+async def _close_stale_session(session: aiohttp.ClientSession) -> None:
+    # Bei geschlossenem Loop ist close() ein No-op; bei gestopptem Loop werden die
+    # Verbindungen sofort geschlossen, nur das Warten auf deren Futures scheitert
+    try:
+        await session.close()
+    except RuntimeError:
+        pass
+
+
+def _default_token_store():
+    """KeyringStore falls ein Schlüsselbund-Backend verfügbar ist, sonst None"""
+    if KeyringStore is None:
+        return None
+    try:
+        return KeyringStore(service_name="mammotion")
+    except KeyringUnavailableError:
+        return None
+
+
+async def close_shared_session() -> None:
+    """
+    Schließt die gemeinsame HTTP-Session
+
+    Anwendungen, die RealMammotionClient nutzen, rufen dies beim Beenden auf;
+    close() der einzelnen Clients lässt die Session offen.
+    """
+    global _shared_session
+    if _shared_session is not None:
+        _, session = _shared_session
+        _shared_session = None
+        if not session.closed:
+            await session.close()
+
 
 @dataclass
 class RealMowerInfo:
@@ -55,11 +162,25 @@ class RealMammotionClient:
     Echter Mammotion-API-Client
     
     Verbindet sich direkt mit Mammotion-Servern und verwaltet echte Mähroboter.
+    Ohne übergebene Session wird die gemeinsame Session aus
+    get_shared_session() verwendet; close() schließt sie nicht.
+    
+    Access-Tokens der HTTP-Anmeldung werden pro E-Mail im token_store
+    (Standard: System-Schlüsselbund) abgelegt, damit spätere Starts ohne
+    Passwort-Login auskommen. Passwörter werden nie gespeichert.
     """
     
-    def __init__(self):
+    # Maximal gleichzeitige Status-Abfragen (schont den Verbindungs-Pool)
+    STATUS_CONCURRENCY = 16
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, token_store=_MISSING):
         self.logger = logging.getLogger(__name__)
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._token_store = _default_token_store() if token_store is _MISSING else token_store
+        self._email: Optional[str] = None
+        self._status_sem: Optional[asyncio.Semaphore] = None
+        # Authorization pro Client, da die Session geteilt wird
+        self._auth_headers: Dict[str, str] = {}
         self._pymammotion_client: Optional[PyMammotionClient] = None
         self._authenticated = False
         self._user_info: Optional[Dict[str, Any]] = None
@@ -81,15 +202,8 @@ class RealMammotionClient:
         
     async def _ensure_session(self):
         """Stellt sicher, dass eine HTTP-Session existiert"""
-        if not self._session:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self._session = aiohttp.ClientSession(
-                timeout=timeout,
-                headers={
-                    'User-Agent': 'Mammotion-Linux-App/1.0',
-                    'Content-Type': 'application/json'
-                }
-            )
+        if self._session is None or self._session.closed:
+            self._session = get_shared_session()
             
     async def authenticate(self, email: str, password: str) -> bool:
         """
@@ -103,6 +217,11 @@ class RealMammotionClient:
             True wenn erfolgreich, False bei Fehler
         """
         self.logger.info(f"Versuche Anmeldung bei Mammotion für {email}")
+        self._email = email
+        
+        # Gültiges Token aus dem Cache spart den Passwort-Login
+        if await self._try_cached_token(email):
+            return True
         
         # Versuche zuerst PyMammotion, dann HTTP-Fallback
         if PYMAMMOTION_AVAILABLE:
@@ -170,8 +289,10 @@ class RealMammotionClient:
                         self._user_info = result
                         self._authenticated = True
                         
-                        # Authorization-Header für weitere Anfragen setzen
-                        self._session.headers['Authorization'] = f"Bearer {result['access_token']}"
+                        # Authorization-Header für weitere Anfragen merken
+                        self._auth_headers = {'Authorization': f"Bearer {result['access_token']}"}
+                        self._email = email
+                        self._store_token(email, result)
                         
                         self.logger.info("Erfolgreich bei Mammotion angemeldet (HTTP)")
                         return True
@@ -186,6 +307,86 @@ class RealMammotionClient:
             self.logger.error(f"HTTP-Authentifizierung fehlgeschlagen: {e}")
             return False
             
+    def _store_token(self, email: str, result: Dict[str, Any]) -> None:
+        """Legt das Access-Token aus der Login-Antwort im Token-Cache ab"""
+        if self._token_store is None:
+            return
+        expires_at = result.get('expires_at')
+        if expires_at is None and result.get('expires_in') is not None:
+            expires_at = time.time() + float(result['expires_in'])
+        entry = {
+            'access_token': result['access_token'],
+            'expires_at': expires_at,
+            'refresh_token': result.get('refresh_token'),
+        }
+        try:
+            self._token_store.set_token(email, json.dumps(entry))
+        except Exception as e:
+            # Schlüsselbund-Backends werfen eigene Fehlertypen
+            self.logger.warning(f"Token konnte nicht gespeichert werden: {e}")
+            
+    async def _try_cached_token(self, email: str) -> bool:
+        """
+        Meldet mit einem gecachten Access-Token an
+        
+        Das Token wird mit einer Geräteabfrage geprüft; abgelaufene oder
+        abgelehnte Tokens werden aus dem Cache entfernt.
+        """
+        if self._token_store is None:
+            return False
+        try:
+            raw = self._token_store.get_token(email)
+        except Exception as e:
+            self.logger.warning(f"Token-Cache nicht lesbar: {e}")
+            return False
+        if not raw:
+            return False
+        
+        try:
+            entry = json.loads(raw)
+            token = entry['access_token']
+            expires_at = entry.get('expires_at')
+        except (ValueError, KeyError, TypeError):
+            self._invalidate_token()
+            return False
+        if expires_at is not None and expires_at - TOKEN_EXPIRY_MARGIN <= time.time():
+            self._invalidate_token()
+            return False
+        
+        await self._ensure_session()
+        headers = {'Authorization': f"Bearer {token}"}
+        try:
+            async with self._session.get(self.devices_url, headers=headers) as response:
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.warning(f"Gecachtes Token nicht prüfbar: {e}")
+            return False
+        if status != 200:
+            self._invalidate_token()
+            return False
+        
+        self._auth_headers = headers
+        self._authenticated = True
+        self.logger.info("Bei Mammotion angemeldet (gecachtes Token)")
+        return True
+        
+    def _invalidate_token(self) -> None:
+        """Verwirft das gecachte Token des aktuellen Benutzers"""
+        if self._token_store is not None and self._email:
+            self._token_store.delete_token(self._email)
+            
+    def _handle_unauthorized(self) -> None:
+        """
+        Reagiert auf HTTP 401: Token verwerfen und Anmeldung zurücksetzen
+        
+        Ohne gespeichertes Passwort ist keine automatische Neuanmeldung
+        möglich; der Aufrufer muss authenticate() erneut aufrufen.
+        """
+        self.logger.warning("Access-Token abgelehnt - erneute Anmeldung erforderlich")
+        self._invalidate_token()
+        self._auth_headers = {}
+        self._authenticated = False
+        
     async def discover_devices(self) -> List[RealMowerInfo]:
         """
         Sucht nach verfügbaren Mammotion-Geräten
@@ -248,7 +449,7 @@ class RealMammotionClient:
         try:
             await self._ensure_session()
             
-            async with self._session.get(self.devices_url) as response:
+            async with self._session.get(self.devices_url, headers=self._auth_headers) as response:
                 if response.status == 200:
                     result = await response.json()
                     
@@ -272,6 +473,8 @@ class RealMammotionClient:
                     self.logger.info(f"{len(devices)} Mammotion-Geräte gefunden")
                     return devices
                 else:
+                    if response.status == 401:
+                        self._handle_unauthorized()
                     self.logger.error(f"HTTP-Fehler bei Geräte-Suche: {response.status}")
                     raise Exception(f"HTTP {response.status}")
                     
@@ -313,11 +516,13 @@ class RealMammotionClient:
                 }
                 
                 url = f"{self.devices_url}/{device_id}/commands"
-                async with self._session.post(url, json=command_data) as response:
+                async with self._session.post(url, json=command_data, headers=self._auth_headers) as response:
                     if response.status == 200:
                         result = await response.json()
                         return result.get('success', False)
                     else:
+                        if response.status == 401:
+                            self._handle_unauthorized()
                         self.logger.error(f"HTTP-Fehler bei Befehl: {response.status}")
                         return False
                         
@@ -360,7 +565,7 @@ class RealMammotionClient:
                 await self._ensure_session()
                 
                 url = f"{self.devices_url}/{device_id}/status"
-                async with self._session.get(url) as response:
+                async with self._status_slots(), self._session.get(url, headers=self._auth_headers) as response:
                     if response.status == 200:
                         data = await response.json()
                         
@@ -377,17 +582,43 @@ class RealMammotionClient:
                             last_seen=datetime.now()
                         )
                     else:
+                        if response.status == 401:
+                            self._handle_unauthorized()
                         return None
                         
         except Exception as e:
             self.logger.error(f"Status abrufen fehlgeschlagen: {e}")
             return None
             
+    def _status_slots(self) -> asyncio.Semaphore:
+        """Semaphore für Status-Abfragen (erst im laufenden Event-Loop erzeugt)"""
+        if self._status_sem is None:
+            self._status_sem = asyncio.Semaphore(self.STATUS_CONCURRENCY)
+        return self._status_sem
+        
+    async def get_all_device_statuses(self, device_ids: Optional[List[str]] = None) -> List[Optional[RealMowerInfo]]:
+        """
+        Holt den Status mehrerer Geräte gleichzeitig
+        
+        Args:
+            device_ids: IDs der Geräte, Standard: alle gefundenen Geräte
+            
+        Returns:
+            Geräteinformationen in der Reihenfolge von device_ids,
+            None für Geräte, deren Abfrage fehlgeschlagen ist
+        """
+        if device_ids is None:
+            device_ids = [device.device_id for device in self._devices]
+        results = await asyncio.gather(
+            *(self.get_device_status(device_id) for device_id in device_ids),
+            return_exceptions=True
+        )
+        return [None if isinstance(result, Exception) else result for result in results]
+        
     async def close(self):
-        """Schließt alle Verbindungen"""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        """Schließt alle Verbindungen (die HTTP-Session bleibt für andere Clients offen)"""
+        self._session = None
+        self._auth_headers = {}
             
         if self._pymammotion_client:
             # PyMammotion-Client schließen falls möglich
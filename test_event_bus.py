@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests für den asyncio EventBus der Web-App
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Füge src-Verzeichnis zum Python-Pfad hinzu
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from mammotion_web.services.event_bus import EventBus
+
+
+async def _start(bus, topic):
+    """Startet einen Subscriber und wartet, bis er registriert ist"""
+    sub = bus.subscribe(topic)
+    first = asyncio.ensure_future(sub.__anext__())
+    await asyncio.sleep(0)
+    return sub, first
+
+
+def test_every_subscriber_receives_every_event():
+    async def scenario():
+        bus = EventBus()
+        sub_a, first_a = await _start(bus, "device:1")
+        sub_b, first_b = await _start(bus, "device:1")
+        await bus.publish("device:1", {"battery": 80})
+        await bus.publish("device:1", {"battery": 79})
+        assert await first_a == {"battery": 80}
+        assert await first_b == {"battery": 80}
+        assert await sub_a.__anext__() == {"battery": 79}
+        assert await sub_b.__anext__() == {"battery": 79}
+        await sub_a.aclose()
+        await sub_b.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_publish_without_subscribers_keeps_nothing():
+    async def scenario():
+        bus = EventBus()
+        for i in range(10):
+            await bus.publish("device:1", i)
+        assert dict(bus._subscribers) == {}
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_subscriber_is_unregistered():
+    async def scenario():
+        bus = EventBus()
+        sub, first = await _start(bus, "device:1")
+        assert len(bus._subscribers["device:1"]) == 1
+        first.cancel()
+        await asyncio.sleep(0)
+        await sub.aclose()
+        assert "device:1" not in bus._subscribers
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_drops_oldest_events():
+    async def scenario():
+        bus = EventBus(maxsize=2)
+        sub, first = await _start(bus, "t")
+        for i in range(5):
+            await bus.publish("t", i)
+        assert await first == 3
+        assert await sub.__anext__() == 4
+        await sub.aclose()
+
+    asyncio.run(scenario())
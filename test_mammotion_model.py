@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Tests für das MammotionModel
+
+Die RealMammotionAPI wird durch einen Fake ersetzt, es werden keine echten
+Mammotion-Server kontaktiert.
+"""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+# Füge src-Verzeichnis zum Python-Pfad hinzu
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from models import mammotion_model as mm
+from models.real_mammotion_api import LocalMowerInfo
+from models.real_mammotion_api import MowerStatus as LocalStatus
+
+
+def local_mower(device_id="m1", status=LocalStatus.IDLE, battery=80):
+    return LocalMowerInfo(
+        device_id=device_id,
+        name=f"Mäher {device_id}",
+        model="Luba 2",
+        battery_level=battery,
+        status=status,
+    )
+
+
+class FakeApi:
+    """Ersetzt RealMammotionAPI und protokolliert alle Aufrufe"""
+
+    def __init__(self, mowers=()):
+        self.mowers = {m.device_id: m for m in mowers}
+        self.calls = []
+
+    async def login(self, email, password):
+        self.calls.append(("login", email))
+        return True
+
+    async def discover_devices(self):
+        self.calls.append(("discover",))
+        return list(self.mowers.values())
+
+    async def get_device_status(self, device_id):
+        self.calls.append(("status", device_id))
+        return self.mowers.get(device_id)
+
+    async def start_mowing(self, device_id):
+        self.calls.append(("start_mowing", device_id))
+        return True
+
+    async def stop_mowing(self, device_id):
+        self.calls.append(("stop_mowing", device_id))
+        return True
+
+    async def return_to_dock(self, device_id):
+        self.calls.append(("return_to_dock", device_id))
+        return True
+
+    async def logout(self):
+        self.calls.append(("logout",))
+
+
+def make_model(mowers=(local_mower(),)):
+    model = mm.MammotionModel()
+    model._api_client = FakeApi(mowers)
+    return model
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def connected_model(mowers=(local_mower(),)):
+    """Eingeloggtes Model mit bereits gefundenen Mähern"""
+    model = make_model(mowers)
+
+    async def scenario():
+        await model.login("user@example.com", "pw")
+        await model.discover_mowers()
+
+    run(scenario())
+    return model
+
+
+# --- Observer ----------------------------------------------------------------
+
+def test_observer_may_unsubscribe_during_notification():
+    model = make_model()
+    events = []
+
+    def once(event, data):
+        events.append(("once", event))
+        model.remove_observer(once)
+
+    model.add_observer(once)
+    model.add_observer(lambda event, data: events.append(("always", event)))
+    model._notify_observers("a")
+    model._notify_observers("b")
+    assert events == [("once", "a"), ("always", "a"), ("always", "b")]
+
+
+def test_bound_method_observer_can_be_removed():
+    class View:
+        def __init__(self):
+            self.events = []
+
+        def on_event(self, event, data):
+            self.events.append(event)
+
+    model = make_model()
+    view = View()
+    model.add_observer(view.on_event)
+    model.remove_observer(view.on_event)
+    model.remove_observer(view.on_event)
+    model._notify_observers("x")
+    assert view.events == []
+
+
+def test_async_observer_does_not_block_command():
+    model = connected_model()
+    release = asyncio.Event()
+    seen = []
+
+    async def slow_observer(event, data):
+        await release.wait()
+        seen.append(event)
+
+    async def scenario():
+        model.add_observer(slow_observer)
+        # Befehl kehrt zurück, obwohl der Observer noch wartet
+        assert await asyncio.wait_for(model.start_mowing(), 1)
+        assert seen == []
+        release.set()
+        await asyncio.gather(*model._observer_tasks)
+
+    run(scenario())
+    assert seen == ["mower_status_changed"]
+    assert not model._observer_tasks
+
+
+def test_async_observer_without_loop_is_skipped():
+    model = make_model()
+
+    async def observer(event, data):
+        raise AssertionError("darf nicht laufen")
+
+    model.add_observer(observer)
+    model._notify_observers("x")
+    assert not model._observer_tasks
+
+
+def test_status_events_only_on_change():
+    model = connected_model()
+    events = []
+    model.add_observer(lambda event, data: events.append(event))
+
+    async def scenario():
+        await model.start_mowing()
+        await model.start_mowing()
+        await model.refresh_status()
+        await model.refresh_status(force=True)
+
+    run(scenario())
+    # Zweiter Start ändert nichts; der erste Refresh setzt den Status der API (idle) zurück
+    assert events == ["mower_status_changed", "mower_status_changed"]
+    assert model.get_current_mower().status == mm.MowerStatus.IDLE
+
+
+def test_local_status_maps_to_model_status():
+    model = make_model()
+    for local in LocalStatus:
+        converted = model._convert_local_to_mower_info(local_mower(status=local))
+        assert converted.status.value == local.value
+
+
+def test_mower_info_has_no_instance_dict():
+    mower = make_model()._convert_local_to_mower_info(local_mower())
+    if sys.version_info >= (3, 10):
+        assert not hasattr(mower, "__dict__")
+    mower.status = mm.MowerStatus.MOWING
+    assert mower.status is mm.MowerStatus.MOWING
+
+
+def test_logout_closes_api_session():
+    model = connected_model()
+    api = model._api_client
+    run(model.logout())
+    assert api.calls[-1] == ("logout",)
+    assert model._api_client is None
+
+
+def test_refresh_all_statuses_runs_in_parallel_and_coalesces_events():
+    model = connected_model([local_mower("m1"), local_mower("m2"), local_mower("m3")])
+    api = model._api_client
+    api.mowers["m1"] = local_mower("m1", status=LocalStatus.MOWING)
+    api.mowers["m3"] = local_mower("m3", battery=12)
+    del api.mowers["m2"]
+    in_flight = []
+    both = asyncio.Event()
+    events = []
+    model.add_observer(lambda event, data: events.append((event, data)))
+    original = api.get_device_status
+
+    async def gated(device_id):
+        in_flight.append(device_id)
+        if len(in_flight) == 3:
+            both.set()
+        await both.wait()
+        return await original(device_id)
+
+    api.get_device_status = gated
+
+    async def scenario():
+        return await asyncio.wait_for(model.refresh_all_statuses(), 1)
+
+    assert run(scenario()) == {"m1": True, "m2": False, "m3": True}
+    assert [e for e, _ in events] == ["mowers_refreshed"]
+    assert [m.device_id for m in events[0][1]["mowers"]] == ["m1", "m3"]
+
+
+def test_refresh_within_ttl_skips_the_api(monkeypatch):
+    model = connected_model()
+    api = model._api_client
+    clock = [100.0]
+    monkeypatch.setattr(mm.time, "monotonic", lambda: clock[0])
+
+    async def scenario():
+        assert await model.refresh_status()
+        assert await model.refresh_status()
+        clock[0] += mm.REFRESH_TTL
+        assert await model.refresh_status()
+        assert await model.refresh_status(force=True)
+
+    run(scenario())
+    assert [c for c in api.calls if c[0] == "status"] == [("status", "m1")] * 3
+
+
+def test_login_does_not_keep_the_password():
+    model = connected_model()
+    assert model._email == "user@example.com"
+    assert "pw" not in vars(model).values()
+
+
+def test_commands_call_api_and_set_target_status():
+    model = connected_model()
+    expected = [
+        (model.start_mowing, "start_mowing", mm.MowerStatus.MOWING),
+        (model.stop_mowing, "stop_mowing", mm.MowerStatus.PAUSED),
+        (model.return_to_dock, "return_to_dock", mm.MowerStatus.RETURNING),
+    ]
+    for command, api_method, status in expected:
+        assert run(command("m1"))
+        assert model._api_client.calls[-1] == (api_method, "m1")
+        assert model.get_current_mower().status is status
+    assert not run(model.start_mowing("unbekannt"))
+
+
+def test_importing_the_model_does_not_load_aiohttp():
+    code = "import sys; import models.mammotion_model; print('aiohttp' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=src_path, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_commands_for_one_mower_are_serialized():
+    model = connected_model([local_mower("m1"), local_mower("m2")])
+    api = model._api_client
+    active = []
+    overlaps = []
+
+    async def slow_command(device_id):
+        active.append(device_id)
+        overlaps.append(list(active))
+        await asyncio.sleep(0.01)
+        active.remove(device_id)
+        return True
+
+    api.start_mowing = api.stop_mowing = slow_command
+
+    async def scenario():
+        await model.start_mowing("m1")
+        overlaps.clear()
+        await asyncio.gather(model.stop_mowing("m1"), model.start_mowing("m1"), model.stop_mowing("m2"))
+
+    run(scenario())
+    # m1-Befehle nie gleichzeitig, m2 läuft parallel dazu
+    assert all(o.count("m1") <= 1 for o in overlaps)
+    assert ["m1", "m2"] in overlaps
+    assert model._mowers["m1"].status is mm.MowerStatus.MOWING
+
+
+def test_all_mowers_view_is_cached_until_the_store_changes():
+    model = connected_model([local_mower("m1"), local_mower("m2")])
+    view = model.get_all_mowers()
+    assert model.get_all_mowers() is view
+    model._api_client.mowers["m2"] = local_mower("m2", battery=10)
+    run(model.refresh_status("m2", force=True))
+    fresh = model.get_all_mowers()
+    assert fresh is not view
+    assert [m.battery_level for m in fresh] == [80, 10]
+    run(model.logout())
+    assert model.get_all_mowers() == ()
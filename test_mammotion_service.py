@@ -0,0 +1,1136 @@
+#!/usr/bin/env python3
+"""
+Tests für den MammotionService der Web-App
+
+PyMammotion wird nicht benötigt: Cloud-Client, Gerätemanager und
+Gerätezustand werden durch einfache Fake-Objekte ersetzt.
+"""
+
+import asyncio
+import importlib
+import logging
+import sys
+import time
+from pathlib import Path
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest
+
+# Füge src-Verzeichnis zum Python-Pfad hinzu
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from mammotion_web.services import mammotion_service as ms
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class FakeDevice:
+    """Typisiertes Cloud-Gerät (wie ListingDevByAccountResponse.data.data[i])"""
+
+    def __init__(self, iot_id, name="Luba", model="Luba 2", category="Mower", identity="ident"):
+        self.iotId = iot_id
+        self.nickName = name
+        self.deviceName = f"dev-{iot_id}"
+        self.productModel = model
+        self.categoryName = category
+        self.identityId = identity
+
+
+class FakeListing:
+    def __init__(self, devices):
+        self.data = SimpleNamespace(data=list(devices))
+
+    def to_dict(self):
+        return {"code": 200, "data": {"data": [vars(d) for d in self.data.data]}}
+
+
+class FakeCloud:
+    devices_by_account_response = None
+
+    def __init__(self, devices):
+        self.devices = list(devices)
+        self.list_calls = 0
+
+    async def list_binding_by_account(self):
+        self.list_calls += 1
+        return FakeListing(self.devices)
+
+
+class FakeMqtt:
+    def is_connected(self):
+        return True
+
+
+class FakeManager:
+    def __init__(self, dev, state=None):
+        self.dev = dev
+        self.state = state
+
+    def cloud(self):
+        return None
+
+
+class FakeMammotion:
+    """Ersetzt den Mammotion-Orchestrator (MQTT + Gerätemanager)"""
+
+    def __init__(self, email):
+        self.mqtt_list = {email: FakeMqtt()}
+        self.created = []
+        self.synced = []
+        self.gate = None
+        self.states = {}
+
+    async def get_or_create_device_by_name(self, dev, mqtt):
+        if self.gate is not None:
+            await self.gate(dev)
+        self.created.append(dev.iotId)
+        return FakeManager(dev, self.states.get(dev.iotId))
+
+    async def start_sync(self, name, retry=0):
+        self.synced.append(name)
+
+
+class FakeState:
+    """Gerätezustand, der nur über to_dict() auswertbar ist"""
+
+    location = None
+    status_properties = None
+    mqtt_properties = None
+
+    def __init__(self, data, online=True):
+        self.data = data
+        self.online = online
+        self.to_dict_calls = 0
+
+    def to_dict(self):
+        self.to_dict_calls += 1
+        return self.data
+
+
+def make_session(devices, email="user@example.com"):
+    return ms.AuthSession(email=email, client=FakeCloud(devices), mammotion=FakeMammotion(email))
+
+
+# --- Session-Store ---------------------------------------------------------
+
+def test_store_roundtrip_and_delete():
+    async def scenario():
+        store = ms.MemorySessionStore(ttl=60)
+        session = ms.AuthSession(email="a@example.com")
+        await store.set("sid", session)
+        assert await store.get("sid") is session
+        assert await store.delete("sid") is session
+        assert await store.get("sid") is None
+
+    run(scenario())
+
+
+def test_store_expires_sessions_after_ttl(monkeypatch):
+    async def scenario():
+        now = [1000.0]
+        monkeypatch.setattr(ms.time, "monotonic", lambda: now[0])
+        store = ms.MemorySessionStore(ttl=10)
+        old = ms.AuthSession(email="old@example.com")
+        await store.set("old", old)
+        now[0] += 5
+        fresh = ms.AuthSession(email="fresh@example.com")
+        await store.set("fresh", fresh)
+        now[0] += 6
+        assert await store.expire() == [old]
+        assert await store.get("fresh") is fresh
+        assert await store.get("old") is None
+
+    run(scenario())
+
+
+def test_store_evicts_oldest_when_full():
+    async def scenario():
+        store = ms.MemorySessionStore(ttl=60, maxsize=2)
+        sessions = [ms.AuthSession(email=f"{i}@example.com") for i in range(3)]
+        for i, session in enumerate(sessions):
+            await store.set(str(i), session)
+        assert await store.get("0") is None
+        assert await store.get("2") is sessions[2]
+        # Evicted sessions are handed to the janitor for cleanup
+        assert await store.expire() == [sessions[0]]
+
+    run(scenario())
+
+
+def test_janitor_closes_dropped_sessions(monkeypatch):
+    closed = []
+
+    class FakeService:
+        async def logout(self, session):
+            closed.append(session)
+
+    async def scenario():
+        store = ms.MemorySessionStore(ttl=0)
+        monkeypatch.setattr(ms, "_get_store", lambda: store)
+        monkeypatch.setattr(ms, "get_service", lambda: FakeService())
+        session = ms.AuthSession(email="a@example.com")
+        await store.set("sid", session)
+        janitor = asyncio.create_task(ms.run_session_janitor(interval=0.001))
+        await asyncio.sleep(0.02)
+        janitor.cancel()
+        return session
+
+    session = run(scenario())
+    assert closed == [session]
+
+
+def test_resolve_unknown_session_raises():
+    with pytest.raises(ms.AuthError):
+        run(ms.resolve_session("does-not-exist"))
+
+
+# --- Gerätemanager ---------------------------------------------------------
+
+def test_uncached_device_triggers_listing_without_deadlock():
+    session = make_session([FakeDevice("iot-1")])
+    service = ms.MammotionService()
+
+    async def scenario():
+        return await asyncio.wait_for(service._get_or_create_manager(session, "iot-1"), 1)
+
+    mgr = run(scenario())
+    assert mgr.dev.iotId == "iot-1"
+    assert session.managers_by_iot["iot-1"] is mgr
+    assert session.client.list_calls == 1
+
+
+def test_managers_for_different_devices_are_created_concurrently():
+    session = make_session([FakeDevice("iot-1"), FakeDevice("iot-2")])
+    service = ms.MammotionService()
+
+    async def scenario():
+        await service.list_devices(session)
+        both_inside = asyncio.Event()
+        inside = []
+
+        async def gate(dev):
+            inside.append(dev.iotId)
+            if len(inside) == 2:
+                both_inside.set()
+            await both_inside.wait()
+
+        session.mammotion.gate = gate
+        await asyncio.wait_for(
+            asyncio.gather(
+                service._get_or_create_manager(session, "iot-1"),
+                service._get_or_create_manager(session, "iot-2"),
+            ),
+            1,
+        )
+
+    run(scenario())
+    assert sorted(session.managers_by_iot) == ["iot-1", "iot-2"]
+
+
+def test_sync_is_started_once_per_device():
+    session = make_session([FakeDevice("iot-1")])
+    service = ms.MammotionService()
+
+    async def scenario():
+        await service._get_or_create_manager(session, "iot-1")
+        # Manager geht verloren (z. B. verworfen) – der Sync läuft bereits
+        session.managers_by_iot.clear()
+        await service._get_or_create_manager(session, "iot-1")
+
+    run(scenario())
+    assert len(session.mammotion.synced) == 1
+    assert session.sync_started == {"iot-1"}
+
+
+def test_cached_manager_is_returned_while_device_lock_is_held():
+    session = make_session([FakeDevice("iot-1")])
+    service = ms.MammotionService()
+
+    async def scenario():
+        mgr = await service._get_or_create_manager(session, "iot-1")
+        async with session.device_locks["iot-1"]:
+            # Warmer Pfad wartet nicht auf das Geräte-Lock
+            assert await asyncio.wait_for(service._get_or_create_manager(session, "iot-1"), 1) is mgr
+
+    run(scenario())
+    assert session.mammotion.created == ["iot-1"]
+
+
+# --- Geräteliste -------------------------------------------------------------
+
+def test_list_devices_is_served_from_cache_within_ttl():
+    session = make_session([FakeDevice("iot-1")])
+    service = ms.MammotionService()
+
+    async def scenario():
+        first = await service.list_devices(session)
+        second = await service.list_devices(session)
+        return first, second
+
+    first, second = run(scenario())
+    assert first == second
+    assert first is second
+    assert first[0].id == "iot-1"
+    assert session.client.list_calls == 1
+
+
+def test_list_devices_refetches_after_ttl_or_invalidation(monkeypatch):
+    session = make_session([FakeDevice("iot-1")])
+    service = ms.MammotionService()
+
+    async def scenario():
+        await service.list_devices(session)
+        service.invalidate_devices(session)
+        await service.list_devices(session)
+        monkeypatch.setattr(ms, "DEVICES_CACHE_TTL", 0.0)
+        await service.list_devices(session)
+
+    run(scenario())
+    assert session.client.list_calls == 3
+
+
+def test_concurrent_listings_share_one_cloud_call():
+    session = make_session([FakeDevice("iot-1")])
+    service = ms.MammotionService()
+
+    async def scenario():
+        await asyncio.gather(*(service.list_devices(session) for _ in range(5)))
+
+    run(scenario())
+    assert session.client.list_calls == 1
+
+
+@pytest.mark.parametrize(
+    "name, model, category, expected",
+    [
+        ("Luba", "Luba 2 AWD", "Mower", False),
+        ("Garten", "RTK Reference", "Mower", True),
+        ("RasenRadar", "X", "", True),
+        ("Luba", "Luba", "Base Station", True),
+        (None, "Unknown", "", False),
+    ],
+)
+def test_is_base_station(name, model, category, expected):
+    assert ms._is_base_station(name, model, category) is expected
+
+
+def test_listing_marks_base_stations():
+    session = make_session([FakeDevice("iot-1"), FakeDevice("iot-2", name="RTK", category="")])
+    devices = run(ms.MammotionService().list_devices(session))
+    assert [d.is_base for d in devices] == [False, True]
+
+
+
+def test_device_views_are_immutable_and_serializable():
+    session = make_session([FakeDevice("iot-1", name="Luba")])
+    view = run(ms.MammotionService().list_devices(session))[0]
+    with pytest.raises(AttributeError):
+        view.name = "other"
+    assert view.as_dict() == {
+        "id": "iot-1", "name": "Luba", "model": "Luba 2",
+        "battery": None, "status": "unknown", "position": None, "is_base": False,
+    }
+
+
+# --- Tiefensuche im Gerätezustand -------------------------------------------
+
+def test_deep_find_many_returns_first_match_per_group_in_one_pass():
+    data = {
+        "report": {"dev": {"battery_val": 77, "sys_status": "ok"}},
+        "location": [{"latitude": 0.8, "longitude": 0.1}, {"latitude": 9.9}],
+        "battery": 5,
+    }
+    hits = ms._deep_find_many(data, {
+        "battery": ms._BATTERY_HINTS,
+        "status": ms._STATUS_TEXT_HINTS,
+        "lat": ms._LAT_HINTS,
+        "lon": ms._LON_HINTS,
+        "missing": ms._hint_re("nope"),
+    })
+    assert hits == {"battery": 77, "status": "ok", "lat": 0.8, "lon": 0.1}
+
+
+def test_deep_find_many_skips_none_values():
+    assert ms._deep_find_many({"battery": None, "x": {"batt": 3}}, {"b": ms._hint_re("batt")}) == {"b": 3}
+
+
+def test_device_status_falls_back_to_deep_state_search():
+    session = make_session([FakeDevice("iot-1")])
+    session.mammotion.states["iot-1"] = FakeState({
+        "report_data": {"dev": {"battery_val": 64, "sys_status": "ready"}},
+        "location": {"device": {"latitude": 48.1, "longitude": 11.5}},
+    })
+    status = run(ms.MammotionService().get_device_status(session, "iot-1"))
+    assert status["battery"] == 64
+    assert status["status"] == "ready"
+    assert status["position"] == {"lat": 48.1, "lon": 11.5}
+    assert status["position_source"] == "live"
+    assert status["online"] is True
+
+
+def test_device_status_serializes_state_once_per_call(monkeypatch):
+    monkeypatch.setattr(ms, "STATUS_CACHE_TTL", 0.0)
+    session = make_session([FakeDevice("iot-1")])
+    state = FakeState({"battery": 50})
+    session.mammotion.states["iot-1"] = state
+    service = ms.MammotionService()
+    # Der erste Aufruf schreibt zusätzlich den Diagnose-Snapshot
+    run(service.get_device_status(session, "iot-1"))
+    assert state.to_dict_calls == 1
+    run(service.get_device_status(session, "iot-1"))
+    assert state.to_dict_calls == 2
+
+
+def test_new_sid_is_urlsafe_and_unique():
+    sids = {ms._new_sid() for _ in range(100)}
+    assert len(sids) == 100
+    assert all(len(s) == 43 and "=" not in s for s in sids)
+    assert all(s.replace("-", "").replace("_", "").isalnum() for s in sids)
+
+
+def test_devices_status_fans_out_with_bounded_concurrency(monkeypatch):
+    ids = [f"iot-{i}" for i in range(5)]
+    session = make_session([FakeDevice(i) for i in ids])
+    service = ms.MammotionService()
+    monkeypatch.setattr(ms, "STATUS_FANOUT", 2)
+    active = [0]
+    peak = [0]
+
+    async def fake_status(sess, device_id):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.001)
+        active[0] -= 1
+        return {"id": device_id}
+
+    monkeypatch.setattr(service, "get_device_status", fake_status)
+    result = run(service.get_devices_status(session, ids))
+    assert result == {i: {"id": i} for i in ids}
+    assert peak[0] == 2
+
+
+def test_devices_status_reports_failing_device_without_failing_others(monkeypatch):
+    ids = ["iot-1", "iot-2", "iot-3"]
+    session = make_session([FakeDevice(i) for i in ids])
+    service = ms.MammotionService()
+
+    async def fake_status(sess, device_id):
+        if device_id == "iot-2":
+            raise ms.NotFoundError("Device not found")
+        return {"id": device_id}
+
+    monkeypatch.setattr(service, "get_device_status", fake_status)
+    result = run(service.get_devices_status(session, ids))
+    assert result == {
+        "iot-1": {"id": "iot-1"},
+        "iot-2": {"id": "iot-2", "error": "Device not found"},
+        "iot-3": {"id": "iot-3"},
+    }
+
+
+class CountingDict(dict):
+    """Zählt vollständige Schlüssel-Scans"""
+
+    scans = 0
+
+    def items(self):
+        CountingDict.scans += 1
+        return super().items()
+
+
+def test_plan_lookup_remembers_matching_key():
+    plan = {}
+    props = CountingDict({"name": "x", "battery_val": 80, "work_mode": 3})
+    CountingDict.scans = 0
+    assert ms._plan_lookup(props, plan, "battery", ms._is_battery_field) == 80
+    assert plan == {"battery": "battery_val"}
+    props["battery_val"] = 79
+    assert ms._plan_lookup(props, plan, "battery", ms._is_battery_field) == 79
+    assert CountingDict.scans == 1
+    # Schlüssel passt nicht mehr: erneuter Scan
+    props["battery_val"] = None
+    props["batt"] = 5
+    assert ms._plan_lookup(props, plan, "battery", ms._is_battery_field) == 5
+    assert plan == {"battery": "batt"}
+
+
+def test_device_status_reads_properties_via_field_plan():
+    session = make_session([FakeDevice("iot-1")])
+    state = FakeState({})
+    state.status_properties = SimpleNamespace(to_dict=lambda: {"battery_level": 42, "work_mode": "MODE_READY"})
+    session.mammotion.states["iot-1"] = state
+    status = run(ms.MammotionService().get_device_status(session, "iot-1"))
+    assert status["battery"] == 42
+    assert session.field_plan_by_iot["iot-1"] == {
+        "status_properties.battery": "battery_level",
+        "status_properties.mode": "work_mode",
+    }
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ({"lat": 48.1, "lon": 11.5}, {"lat": 48.1, "lon": 11.5}),
+        ({"lat": "48.1", "lon": 11}, {"lat": 48.1, "lon": 11.0}),
+        ({"lat": 0.0, "lon": 0.00001}, None),
+        ({"lat": 91.0, "lon": 0.5}, None),
+        ({"lat": float("nan"), "lon": 1.0}, None),
+        ({"lat": "x", "lon": 1.0}, None),
+        ({"lat": None, "lon": 1.0}, None),
+        (None, None),
+    ],
+)
+def test_clean_latlon(raw, expected):
+    assert ms._clean_latlon(raw) == expected
+
+
+def test_listing_updates_device_cache_by_membership_only():
+    first, second = FakeDevice("iot-1"), FakeDevice("iot-2")
+    session = make_session([first, second])
+    service = ms.MammotionService()
+
+    async def scenario():
+        await service.list_devices(session)
+        cached = dict(session.devices_by_iot)
+        # iot-2 entfällt, iot-3 kommt hinzu; der Eintrag für iot-1 bleibt dasselbe Objekt
+        session.client.devices = [FakeDevice("iot-1"), FakeDevice("iot-3")]
+        service.invalidate_devices(session)
+        await service.list_devices(session)
+        return cached
+
+    cached = run(scenario())
+    assert cached == {"iot-1": first, "iot-2": second}
+    assert sorted(session.devices_by_iot) == ["iot-1", "iot-3"]
+    assert session.devices_by_iot["iot-1"] is first
+
+
+def test_wait_until_returns_as_soon_as_predicate_holds():
+    calls = []
+
+    def ready():
+        calls.append(1)
+        return len(calls) >= 3
+
+    started = time.monotonic()
+    assert run(ms._wait_until(ready, timeout=5)) is True
+    # 0.02 + 0.04 s Backoff statt 2 × 0.25 s
+    assert time.monotonic() - started < 0.2
+
+
+def test_wait_until_gives_up_after_timeout():
+    assert run(ms._wait_until(lambda: False, timeout=0.05)) is False
+
+
+class ClosingCloud:
+    def __init__(self):
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+
+
+def test_concurrent_logins_share_one_upstream_flow(monkeypatch):
+    service = ms.MammotionService()
+    calls = []
+    opened = []
+
+    async def fake_cloud_login(email, password):
+        calls.append((email, password))
+        await asyncio.sleep(0.01)
+        return f"cloud-{len(calls)}"
+
+    async def fake_open_session(email, password, cloud):
+        opened.append(cloud)
+        return f"sid-{len(opened)}"
+
+    monkeypatch.setattr(service, "_cloud_login", fake_cloud_login)
+    monkeypatch.setattr(service, "_open_session", fake_open_session)
+
+    async def scenario():
+        same = await asyncio.gather(*(service.login("a@example.com", "pw") for _ in range(3)))
+        other = await service.login("a@example.com", "other")
+        return same, other
+
+    same, other = run(scenario())
+    assert len(calls) == 2
+    assert opened == ["cloud-1"] * 3 + ["cloud-2"]
+    assert sorted(same) == ["sid-1", "sid-2", "sid-3"] and other == "sid-4"
+    assert ms._login_inflight == {}
+
+
+def test_concurrent_logins_get_independent_sessions(monkeypatch):
+    service = ms.MammotionService()
+    cloud = ClosingCloud()
+    acquired = []
+    released = []
+
+    async def fake_cloud_login(email, password):
+        await asyncio.sleep(0.01)
+        return cloud
+
+    async def fake_acquire(email, password):
+        acquired.append(email)
+        return SimpleNamespace(mqtt_list={})
+
+    async def fake_release(email):
+        released.append(email)
+
+    monkeypatch.setattr(service, "_cloud_login", fake_cloud_login)
+    monkeypatch.setattr(ms, "_acquire_mammotion", fake_acquire)
+    monkeypatch.setattr(ms, "_release_mammotion", fake_release)
+    monkeypatch.setattr(ms, "_client_refs", {})
+
+    async def scenario():
+        first, second = await asyncio.gather(
+            service.login("a@example.com", "pw"),
+            service.login("a@example.com", "pw"),
+        )
+        assert first != second
+        await service.logout(await ms.resolve_session(first))
+        await ms.delete_session(first)
+        # Die zweite Sitzung bleibt gültig und ihr Cloud-Client offen
+        remaining = await ms.resolve_session(second)
+        assert remaining.client is cloud and cloud.closed == 0
+        assert (len(acquired), len(released)) == (2, 1)
+        await service.logout(remaining)
+        await ms.delete_session(second)
+
+    run(scenario())
+    assert cloud.closed == 1
+    assert ms._client_refs == {}
+
+
+def test_concurrent_login_failure_reaches_every_caller(monkeypatch):
+    service = ms.MammotionService()
+
+    async def fake_cloud_login(email, password):
+        await asyncio.sleep(0.01)
+        raise ms.AuthError("Authentication failed")
+
+    monkeypatch.setattr(service, "_cloud_login", fake_cloud_login)
+
+    async def scenario():
+        return await asyncio.gather(
+            service.login("a@example.com", "pw"),
+            service.login("a@example.com", "pw"),
+            return_exceptions=True,
+        )
+
+    results = run(scenario())
+    assert all(isinstance(r, ms.AuthError) for r in results)
+
+
+def test_location_point_handles_missing_and_zero_points():
+    loc = SimpleNamespace(
+        device=SimpleNamespace(latitude=48.1, longitude=11.5),
+        dock=SimpleNamespace(latitude=0, longitude=0),
+    )
+    assert ms._location_point(ms._GET_DEVICE_LATLON, loc) == {"lat": 48.1, "lon": 11.5}
+    assert ms._location_point(ms._GET_DOCK_LATLON, loc) is None
+    assert ms._location_point(ms._GET_RTK_LATLON, loc) is None
+
+
+def test_device_status_uses_dock_when_device_point_is_empty():
+    session = make_session([FakeDevice("iot-1")])
+    state = FakeState({})
+    state.location = SimpleNamespace(
+        device=SimpleNamespace(latitude=0, longitude=0),
+        dock=SimpleNamespace(latitude=48.2, longitude=11.6),
+    )
+    session.mammotion.states["iot-1"] = state
+    status = run(ms.MammotionService().get_device_status(session, "iot-1"))
+    assert status["position"] == {"lat": 48.2, "lon": 11.6}
+
+
+def test_device_status_reads_dataclass_properties_without_to_dict(caplog):
+    caplog.set_level(logging.INFO, logger="MammotionService")
+    @dataclass
+    class StatusProperties:
+        battery_val: int = 0
+        work_mode: int = 0
+        extra: dict = None
+        to_dict_calls = 0
+
+        def to_dict(self):
+            StatusProperties.to_dict_calls += 1
+            return {}
+
+    session = make_session([FakeDevice("iot-1")])
+    state = FakeState({})
+    state.status_properties = StatusProperties(battery_val=88, work_mode=13, extra={"batt": 1})
+    session.mammotion.states["iot-1"] = state
+    assert ms._scalar_fields(state.status_properties) == {"battery_val": 88, "work_mode": 13}
+    assert ms._scalar_fields({"battery": 1}) is None
+    service = ms.MammotionService()
+    for _ in range(2):
+        status = run(service.get_device_status(session, "iot-1"))
+        assert status["battery"] == 88
+    # Nur der einmalige Diagnose-Log serialisiert die Properties
+    assert StatusProperties.to_dict_calls == 1
+
+
+def test_plan_lookup_probes_known_keys_before_scanning():
+    plan = {}
+    props = CountingDict({"aux_batt_temp": 31, "battery_level": 70})
+    CountingDict.scans = 0
+    assert ms._plan_lookup(props, plan, "battery", ms._is_battery_field, ms._BATTERY_KEYS) == 70
+    assert plan == {"battery": "battery_level"}
+    assert CountingDict.scans == 0
+
+
+def test_device_status_skips_diagnostics_when_info_is_disabled(caplog, monkeypatch):
+    caplog.set_level(logging.WARNING, logger="MammotionService")
+    searches = []
+    deep_find_many = ms._deep_find_many
+
+    def spy(d, wanted):
+        searches.append(wanted)
+        return deep_find_many(d, wanted)
+
+    monkeypatch.setattr(ms, "_deep_find_many", spy)
+    session = make_session([FakeDevice("iot-1")])
+    state = FakeState({})
+    state.status_properties = SimpleNamespace(to_dict=lambda: {"battery": 61})
+    session.mammotion.states["iot-1"] = state
+    service = ms.MammotionService()
+    status = run(service.get_device_status(session, "iot-1"))
+    assert status["battery"] == 61
+    # Kein Diagnose-Snapshot ohne INFO-Logging
+    assert ms._DIAG_HINT_KEYS not in searches
+    assert "iot-1" not in service._diagged
+
+
+class FakeOrchestrator:
+    """Gemeinsamer Mammotion-Orchestrator mit zählbaren MQTT-Verbindungen"""
+
+    def __init__(self):
+        self.mqtt_list = {}
+        self.connects = []
+        self.disconnects = []
+
+    async def login_and_initiate_cloud(self, email, password):
+        self.connects.append(email)
+        mqtt = FakeMqtt()
+        mqtt.disconnect = lambda: self.disconnects.append(email)
+        self.mqtt_list[email] = mqtt
+
+
+def test_sessions_share_mqtt_connection_until_last_release(monkeypatch):
+    orchestrator = FakeOrchestrator()
+    monkeypatch.setattr(ms, "_new_mammotion", lambda: orchestrator)
+    monkeypatch.setattr(ms, "_mammotion", None)
+    monkeypatch.setattr(ms, "_mammotion_refs", {})
+
+    async def scenario():
+        first = await ms._acquire_mammotion("a@example.com", "pw")
+        second = await ms._acquire_mammotion("a@example.com", "pw")
+        await ms._acquire_mammotion("b@example.com", "pw")
+        assert first is second is orchestrator
+        assert orchestrator.connects == ["a@example.com", "b@example.com"]
+        await ms._release_mammotion("a@example.com")
+        assert orchestrator.disconnects == []
+        await ms._release_mammotion("a@example.com")
+        assert orchestrator.disconnects == ["a@example.com"]
+        assert list(orchestrator.mqtt_list) == ["b@example.com"]
+        # Neuer Login nach dem letzten Logout verbindet erneut
+        await ms._acquire_mammotion("a@example.com", "pw")
+        assert orchestrator.connects[-1] == "a@example.com"
+
+    run(scenario())
+    assert ms._mammotion_refs == {"a@example.com": 1, "b@example.com": 1}
+
+
+def test_mammotion_lock_follows_the_running_loop():
+    async def lock_in_loop():
+        async with ms._mammotion_guard():
+            return ms._mammotion_guard()
+
+    first = run(lock_in_loop())
+    # Ein neuer Event-Loop (Reload, nächster Testlauf) bekommt ein eigenes Lock
+    second = run(lock_in_loop())
+    assert first is not second
+
+
+def test_device_status_reuses_result_until_state_is_updated(monkeypatch):
+    monkeypatch.setattr(ms, "STATUS_CACHE_TTL", 0.0)
+    session = make_session([FakeDevice("iot-1")])
+    state = FakeState({"battery": 40})
+    session.mammotion.states["iot-1"] = state
+    service = ms.MammotionService()
+
+    async def scenario():
+        mgr = await service._get_or_create_manager(session, "iot-1")
+        mgr.state_manager = SimpleNamespace(last_updated_at=1)
+        first = await service.get_device_status(session, "iot-1")
+        calls = state.to_dict_calls
+        again = await service.get_device_status(session, "iot-1")
+        assert state.to_dict_calls == calls
+        # Neue Benachrichtigung: Zustand wird erneut ausgewertet
+        state.data = {"battery": 39}
+        mgr.state_manager.last_updated_at = 2
+        updated = await service.get_device_status(session, "iot-1")
+        return first, again, updated
+
+    first, again, updated = run(scenario())
+    assert again == first and again is not first
+    assert (first["battery"], updated["battery"]) == (40, 39)
+
+
+class FakeStateManager:
+    """Wie pymammotions StateManager: nur notification() setzt last_updated_at"""
+
+    def __init__(self, device):
+        self.device = device
+        self.last_updated_at = 1
+
+    def properties(self, props):
+        self.device.mqtt_properties = props
+
+    def status(self, props, online=True):
+        self.device.status_properties = props
+        self.device.online = online
+
+
+def test_device_status_is_rebuilt_after_properties_or_status_push(monkeypatch):
+    monkeypatch.setattr(ms, "STATUS_CACHE_TTL", 0.0)
+    session = make_session([FakeDevice("iot-1")])
+    state = FakeState({"battery": 40})
+    session.mammotion.states["iot-1"] = state
+    service = ms.MammotionService()
+
+    async def scenario():
+        mgr = await service._get_or_create_manager(session, "iot-1")
+        mgr.state_manager = FakeStateManager(state)
+        first = await service.get_device_status(session, "iot-1")
+        state.data = {"battery": 39}
+        mgr.state_manager.properties(SimpleNamespace())
+        after_properties = await service.get_device_status(session, "iot-1")
+        mgr.state_manager.status(SimpleNamespace(), online=False)
+        after_status = await service.get_device_status(session, "iot-1")
+        return first, after_properties, after_status
+
+    first, after_properties, after_status = run(scenario())
+    assert (first["battery"], after_properties["battery"]) == (40, 39)
+    assert (first["online"], after_status["online"]) == (True, False)
+
+
+def test_preload_reports_import_failure(monkeypatch):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def failing_import(name, *args, **kwargs):
+        if name.startswith("pymammotion"):
+            raise ImportError("missing")
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", failing_import)
+    assert ms.preload_pymammotion() is False
+
+
+def test_device_status_falls_back_to_listing_on_unexpected_state_error():
+    class BrokenState(FakeState):
+        @property
+        def location(self):
+            raise RuntimeError("boom")
+
+    session = make_session([FakeDevice("iot-1")])
+    session.mammotion.states["iot-1"] = BrokenState({})
+    status = run(ms.MammotionService().get_device_status(session, "iot-1"))
+    assert status["id"] == "iot-1"
+    assert status["status"] == "unknown"
+    assert "position_source" not in status
+
+
+@pytest.mark.parametrize("value, expected", [(13, "mowing"), (11, "standby"), (15.0, "charging"), (99, "mode_99")])
+def test_map_work_mode(value, expected):
+    assert ms._map_work_mode(value) == expected
+
+
+def test_deep_find_many_collects_work_mode_in_same_pass():
+    data = {"a": [{"workMode": "text"}, {"x": {"sys_work_mode": 13}}], "batt": 9}
+    hits = ms._deep_find_many(data, {"battery": ms._BATTERY_HINTS}, work_mode=True)
+    assert hits == {"battery": 9, "work_mode": 13}
+    assert ms._deep_find_many(data, {}) == {}
+
+
+def test_deep_find_many_handles_deep_nesting_without_recursion():
+    data = {"battery": None}
+    node = data
+    for _ in range(5000):
+        node["child"] = {}
+        node = node["child"]
+    node["battery"] = 12
+    assert ms._deep_find_many(data, {"battery": ms._BATTERY_HINTS}) == {"battery": 12}
+
+
+class FakeCloudDevice:
+    """Cloud-Gerät mit zählbaren Befehlen und Attributzugriffen"""
+
+    def __init__(self):
+        self.calls = []
+        self.lookups = 0
+
+    def __getattribute__(self, name):
+        if name in ("start_map_hash", "start", "queue_command"):
+            object.__getattribute__(self, "__dict__")["lookups"] += 1
+        return object.__getattribute__(self, name)
+
+    async def start(self):
+        self.calls.append("start")
+
+    def queue_command(self, name):
+        self.calls.append(f"queued:{name}")
+
+
+def test_send_command_reuses_resolved_entry_point():
+    session = make_session([FakeDevice("iot-1")])
+    service = ms.MammotionService()
+    cloud = FakeCloudDevice()
+
+    async def scenario():
+        mgr = await service._get_or_create_manager(session, "iot-1")
+        mgr.cloud = lambda: cloud
+        await service.send_command(session, "iot-1", "start")
+        lookups = cloud.lookups
+        await service.send_command(session, "iot-1", " START_MOWING ")
+        assert cloud.lookups == lookups
+        await service.send_command(session, "iot-1", "dock")
+
+    run(scenario())
+    assert cloud.calls == ["start", "start", "queued:return_to_dock"]
+
+
+def test_send_command_rejects_unknown_command_before_connecting():
+    session = make_session([FakeDevice("iot-1")])
+    with pytest.raises(ms.CommandError):
+        run(ms.MammotionService().send_command(session, "iot-1", "dance"))
+    assert session.mammotion.created == []
+
+
+def test_overlapping_status_requests_share_one_lookup(monkeypatch):
+    session = make_session([FakeDevice("iot-1"), FakeDevice("iot-2")])
+    service = ms.MammotionService()
+    calls = []
+
+    async def fake_status(sess, device_id):
+        calls.append(device_id)
+        await asyncio.sleep(0.01)
+        return {"id": device_id}
+
+    monkeypatch.setattr(service, "_get_device_status", fake_status)
+
+    async def scenario():
+        return await asyncio.gather(
+            service.get_device_status(session, "iot-1"),
+            service.get_device_status(session, "iot-1"),
+            service.get_device_status(session, "iot-2"),
+        )
+
+    first, second, other = run(scenario())
+    assert calls == ["iot-1", "iot-2"]
+    assert first == second == {"id": "iot-1"} and first is not second
+    assert other == {"id": "iot-2"}
+    assert session.status_inflight == {}
+
+
+def test_status_results_are_reused_briefly_and_dropped_after_commands(monkeypatch):
+    session = make_session([FakeDevice("iot-1")])
+    service = ms.MammotionService()
+    calls = []
+    now = [100.0]
+    monkeypatch.setattr(ms.time, "monotonic", lambda: now[0])
+
+    async def fake_status(sess, device_id):
+        calls.append(device_id)
+        return {"id": device_id, "n": len(calls)}
+
+    monkeypatch.setattr(service, "_get_device_status", fake_status)
+    cloud = FakeCloudDevice()
+
+    async def scenario():
+        mgr = await service._get_or_create_manager(session, "iot-1")
+        mgr.cloud = lambda: cloud
+        assert (await service.get_device_status(session, "iot-1"))["n"] == 1
+        now[0] += 0.1
+        assert (await service.get_device_status(session, "iot-1"))["n"] == 1
+        await service.send_command(session, "iot-1", "start")
+        assert (await service.get_device_status(session, "iot-1"))["n"] == 2
+        now[0] += 1.0
+        assert (await service.get_device_status(session, "iot-1"))["n"] == 3
+
+    run(scenario())
+
+
+def test_status_lookup_overlapping_a_command_is_not_cached(monkeypatch):
+    session = make_session([FakeDevice("iot-1")])
+    service = ms.MammotionService()
+    calls = []
+    release = []
+
+    async def fake_status(sess, device_id):
+        calls.append(device_id)
+        if len(calls) == 1:
+            # Erste Abfrage hängt, bis der Befehl durch ist
+            gate = asyncio.Event()
+            release.append(gate)
+            await gate.wait()
+        return {"id": device_id, "n": len(calls)}
+
+    monkeypatch.setattr(service, "_get_device_status", fake_status)
+    cloud = FakeCloudDevice()
+
+    async def scenario():
+        mgr = await service._get_or_create_manager(session, "iot-1")
+        mgr.cloud = lambda: cloud
+        pending = asyncio.ensure_future(service.get_device_status(session, "iot-1"))
+        while not release:
+            await asyncio.sleep(0)
+        await service.send_command(session, "iot-1", "start")
+        release[0].set()
+        assert (await pending)["n"] == 1
+        # Der vor dem Befehl gestartete Stand wird nicht ausgeliefert
+        assert (await service.get_device_status(session, "iot-1"))["n"] == 2
+
+    run(scenario())
+
+
+def test_device_status_reports_cached_position_when_live_fix_is_missing(monkeypatch):
+    monkeypatch.setattr(ms, "STATUS_CACHE_TTL", 0.0)
+    session = make_session([FakeDevice("iot-1")])
+    state = FakeState({"battery": 50, "location": {"latitude": 48.1, "longitude": 11.5}})
+    session.mammotion.states["iot-1"] = state
+    service = ms.MammotionService()
+    first = run(service.get_device_status(session, "iot-1"))
+    state.data = {"battery": 49}
+    second = run(service.get_device_status(session, "iot-1"))
+    assert first["position_source"] == "live"
+    assert second["position"] == {"lat": 48.1, "lon": 11.5}
+    assert second["position_source"] == "cached"
+    assert session.battery_by_iot == {"iot-1": 49}
+    assert second["position_updated_at"] == int(session.updated_at_by_iot["iot-1"])
+
+
+class FakeDataEvent:
+    def __init__(self):
+        self.subscribers = []
+
+    def add_subscribers(self, fn):
+        self.subscribers.append(fn)
+
+    def remove_subscribers(self, fn):
+        self.subscribers.remove(fn)
+
+    async def data_event(self, data):
+        for fn in list(self.subscribers):
+            await fn()
+
+
+class EventMqtt:
+    def __init__(self):
+        self.connected = False
+        self.on_connected_event = FakeDataEvent()
+        self.polls = 0
+
+    def is_connected(self):
+        self.polls += 1
+        return self.connected
+
+
+def test_wait_connected_wakes_on_connect_event():
+    mqtt = EventMqtt()
+
+    async def scenario():
+        async def connect_later():
+            await asyncio.sleep(0.01)
+            mqtt.connected = True
+            await mqtt.on_connected_event.data_event(None)
+
+        asyncio.ensure_future(connect_later())
+        return await ms._wait_connected(mqtt, timeout=1)
+
+    assert run(scenario()) is True
+    assert mqtt.polls == 2
+    assert mqtt.on_connected_event.subscribers == []
+
+
+def test_wait_connected_times_out():
+    mqtt = EventMqtt()
+    assert run(ms._wait_connected(mqtt, timeout=0.01)) is False
+    assert mqtt.on_connected_event.subscribers == []
+
+
+def test_missing_identity_is_refreshed_from_device_binding():
+    session = make_session([FakeDevice("iot-1", identity="")])
+    refreshed = FakeDevice("iot-1", identity="ident-2")
+    replies = {"iot-1": SimpleNamespace(data=SimpleNamespace(data=[refreshed]))}
+
+    async def list_binding_by_dev(iot_id):
+        return replies.get(iot_id, SimpleNamespace(data=None))
+
+    session.client.list_binding_by_dev = list_binding_by_dev
+    mgr = run(ms.MammotionService()._get_or_create_manager(session, "iot-1"))
+    assert mgr.dev is refreshed
+    assert session.devices_by_iot["iot-1"] is refreshed
+
+
+def test_empty_device_binding_keeps_listed_device():
+    listed = FakeDevice("iot-1", identity=None)
+    session = make_session([listed])
+
+    async def list_binding_by_dev(iot_id):
+        return SimpleNamespace(data=SimpleNamespace(data=[]))
+
+    session.client.list_binding_by_dev = list_binding_by_dev
+    mgr = run(ms.MammotionService()._get_or_create_manager(session, "iot-1"))
+    assert mgr.dev is listed
+
+
+def test_unchanged_position_does_not_bump_update_time(monkeypatch):
+    monkeypatch.setattr(ms, "STATUS_CACHE_TTL", 0.0)
+    session = make_session([FakeDevice("iot-1")])
+    session.mammotion.states["iot-1"] = FakeState({"location": {"latitude": 48.1, "longitude": 11.5}})
+    service = ms.MammotionService()
+    run(service.get_device_status(session, "iot-1"))
+    assert session.pos_by_iot["iot-1"] == (48.1, 11.5)
+    first_update = session.updated_at_by_iot["iot-1"]
+    session.updated_at_by_iot["iot-1"] = first_update - 60
+    run(service.get_device_status(session, "iot-1"))
+    assert session.updated_at_by_iot["iot-1"] == first_update - 60
+
+
+def test_status_falls_back_to_listing_index():
+    session = make_session([FakeDevice("iot-1"), FakeDevice("iot-2", name="Yuka")])
+    service = ms.MammotionService()
+    status = run(service._get_device_status(session, "iot-2"))
+    assert status["id"] == "iot-2" and status["status"] == "unknown"
+    assert session.devices_index["iot-2"].name == "Yuka"
+    with pytest.raises(ms.NotFoundError):
+        run(service._get_device_status(session, "iot-9"))
+
+
+def test_get_service_is_created_lazily_once():
+    ms.get_service.cache_clear()
+    try:
+        assert ms.get_service() is ms.get_service()
+        assert ms.get_service.cache_info().misses == 1
+    finally:
+        ms.get_service.cache_clear()
+
+
+def test_import_reads_no_settings(monkeypatch):
+    from mammotion_web import config
+
+    calls = []
+    real = config.get_settings
+    monkeypatch.setattr(config, "get_settings", lambda: calls.append(1) or real())
+    monkeypatch.delitem(sys.modules, "mammotion_web.services.mammotion_service")
+    fresh = importlib.import_module("mammotion_web.services.mammotion_service")
+    assert calls == []
+    # Erst der Session-Store liest die Einstellungen
+    fresh._get_store()
+    assert calls == [1]
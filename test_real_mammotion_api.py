@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Tests für die RealMammotionAPI
+
+Es werden keine echten Mammotion-Server kontaktiert.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Füge src-Verzeichnis zum Python-Pfad hinzu
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+import orjson
+
+from models.real_mammotion_api import RealMammotionAPI
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# --- HTTP-Session --------------------------------------------------------------
+
+def test_session_is_reused_with_bounded_keepalive_pool():
+    async def scenario():
+        api = RealMammotionAPI()
+        await api._ensure_session()
+        session = api.session
+        await api._ensure_session()
+        assert api.session is session
+        assert session.connector.limit == RealMammotionAPI.POOL_LIMIT
+        assert session.timeout.connect == 5
+        await api.logout()
+        assert session.closed
+
+    run(scenario())
+
+
+# --- Zeitstempel -----------------------------------------------------------------
+
+def test_now_iso_is_shared_within_one_second(monkeypatch):
+    from models import real_mammotion_api as api_module
+
+    clock = [1_700_000_000.1]
+    monkeypatch.setattr(api_module.time, "time", lambda: clock[0])
+    monkeypatch.setattr(api_module, "_now_iso_cache", (0, ""))
+    first = api_module._now_iso()
+    clock[0] += 0.5
+    assert api_module._now_iso() is first
+    clock[0] += 1
+    later = api_module._now_iso()
+    assert later != first and len(later) == len("2023-11-14T22:13:21")
+
+
+def test_context_manager_opens_one_session_and_closes_it():
+    async def scenario():
+        async with RealMammotionAPI() as api:
+            session = api.session
+            assert session is not None and not session.closed
+            await api.connect()
+            assert api.session is session
+        assert session.closed
+
+    run(scenario())
+
+
+# --- Requests --------------------------------------------------------------------
+
+class FakeResponse:
+    def __init__(self, status=200, payload=None):
+        self.status = status
+        self.payload = payload or {}
+
+    async def read(self):
+        if isinstance(self.payload, bytes):
+            return self.payload
+        return orjson.dumps(self.payload)
+
+
+class FakeSession:
+    """Ersetzt aiohttp.ClientSession und zählt gleichzeitig offene Requests"""
+
+    closed = False
+
+    def __init__(self, delay=0.0, responses=None):
+        self.delay = delay
+        self.responses = responses or {}
+        self.active = 0
+        self.peak = 0
+        self.requests = []
+
+    def _request(self, method, url, **kwargs):
+        session = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                session.requests.append((method, url, kwargs))
+                session.active += 1
+                session.peak = max(session.peak, session.active)
+                await asyncio.sleep(session.delay)
+                return session.responses.get((method, url), FakeResponse())
+
+            async def __aexit__(self, *exc):
+                session.active -= 1
+
+        return _Ctx()
+
+    def get(self, url, **kwargs):
+        return self._request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._request("POST", url, **kwargs)
+
+    async def close(self):
+        self.closed = True
+
+
+def logged_in_api(session, **kwargs):
+    from models.real_mammotion_api import MammotionCredentials
+
+    api = RealMammotionAPI(**kwargs)
+    api.session = session
+    api.credentials = MammotionCredentials(email="user@example.com", password="", access_token="token")
+    return api
+
+
+def test_concurrent_requests_are_bounded():
+    session = FakeSession(delay=0.01)
+    api = logged_in_api(session, max_concurrent=3)
+
+    async def scenario():
+        return await api.get_devices_status([f"m{i}" for i in range(10)])
+
+    statuses = run(scenario())
+    assert len(statuses) == 10
+    assert [url.rsplit("/", 1)[1] for _, url, _ in session.requests] == [f"m{i}" for i in range(10)]
+    assert session.peak == 3
+
+
+def test_status_is_decoded_and_invalid_json_falls_back_to_cache():
+    from models.real_mammotion_api import MowerStatus
+
+    url = f"{RealMammotionAPI.DEVICES_URL}/m1"
+    device = {"deviceId": "m1", "deviceName": "Yuka", "status": "mowing", "batteryLevel": 50}
+    session = FakeSession(responses={("GET", url): FakeResponse(payload=device)})
+    api = logged_in_api(session)
+    mower = run(api.get_device_status("m1"))
+    assert (mower.name, mower.status, mower.battery_level) == ("Yuka", MowerStatus.MOWING, 50)
+
+    session.responses[("GET", url)] = FakeResponse(payload=b"<html>")
+    api._devices["m1"] = api._parse_device_data(device)
+    mower = run(api.get_device_status("m1"))
+    assert mower is not None and mower.status is MowerStatus.MOWING
+
+
+def test_command_body_is_encoded_with_orjson():
+    session = FakeSession()
+    api = logged_in_api(session)
+    assert run(api.start_mowing("m1"))
+    method, url, kwargs = session.requests[-1]
+    assert (method, url) == ("POST", RealMammotionAPI.CONTROL_URL)
+    assert orjson.loads(kwargs["data"]) == {"deviceId": "m1", "command": "start", "params": {}}
+
+
+def test_parse_maps_api_status_strings():
+    from models.real_mammotion_api import MowerStatus
+
+    api = RealMammotionAPI()
+    for status in MowerStatus:
+        assert api._parse_device_data({"status": status.value}).status is status
+    assert api._parse_device_data({"status": "sleeping"}).status is MowerStatus.UNKNOWN
+    assert api._parse_device_data({}).status is MowerStatus.UNKNOWN
+
+
+def test_auth_header_is_built_once_per_token():
+    session = FakeSession()
+    api = logged_in_api(session)
+
+    async def scenario():
+        await api.get_device_status("m1")
+        await api.start_mowing("m1")
+        api.credentials.access_token = "neu"
+        await api.get_device_status("m1")
+
+    run(scenario())
+    headers = [kwargs["headers"] for _, _, kwargs in session.requests]
+    assert headers[0] is headers[1]
+    assert headers[0] == {"Authorization": "Bearer token"}
+    assert headers[2] == {"Authorization": "Bearer neu"}
+
+
+def test_email_validation():
+    api = RealMammotionAPI()
+    assert api._is_valid_email("user@example.com")
+    for invalid in ("user", "user@localhost", "a@b@c.de", "@example.com", "user @example.com", "user@example.com\n"):
+        assert not api._is_valid_email(invalid), invalid
+
+
+def test_dev_login_token_is_stable_per_email():
+    session = FakeSession(responses={("POST", RealMammotionAPI.LOGIN_URL): FakeResponse(status=503)})
+    api = RealMammotionAPI()
+    api.session = session
+    assert run(api.login("user@example.com", "geheim123"))
+    token = api.credentials.access_token
+    assert token.startswith("dev_token_") and len(token) == len("dev_token_") + 16
+    assert run(api.login("user@example.com", "geheim123"))
+    assert api.credentials.access_token == token
+
+
+def test_fallbacks_update_the_cached_mower_in_place():
+    from models.real_mammotion_api import MowerStatus
+
+    session = FakeSession(responses={
+        ("POST", RealMammotionAPI.CONTROL_URL): FakeResponse(status=503),
+        ("GET", f"{RealMammotionAPI.DEVICES_URL}/m1"): FakeResponse(status=503),
+    })
+    api = logged_in_api(session)
+    cached = api._devices["m1"] = api._parse_device_data({"deviceId": "m1", "status": "idle", "batteryLevel": 50})
+    assert run(api.send_command("m1", "dock"))
+    assert cached.status is MowerStatus.RETURNING
+    mower = run(api.get_device_status("m1"))
+    assert mower is cached
+    assert 48 <= mower.battery_level <= 53 and mower.last_update
+
+
+def test_parse_rejects_malformed_entries_only():
+    api = RealMammotionAPI()
+    assert api._parse_device_data({"deviceId": "m1", "position": None}).position is None
+    assert api._parse_device_data({"position": {"latitude": 1.5}}).position == {"lat": 1.5, "lon": 0.0}
+    for malformed in (["m1"], {"position": "52.1,13.4"}, {"status": ["idle"]}):
+        assert api._parse_device_data(malformed) is None
+
+
+def test_api_dataclasses_have_no_instance_dict():
+    from models.real_mammotion_api import MammotionCredentials
+
+    mower = RealMammotionAPI()._parse_device_data({"deviceId": "m1"})
+    credentials = MammotionCredentials(email="user@example.com", password="")
+    if sys.version_info >= (3, 10):
+        assert not hasattr(mower, "__dict__")
+        assert not hasattr(credentials, "__dict__")
+
+
+def test_large_device_lists_are_parsed_off_the_event_loop(monkeypatch):
+    import threading
+
+    devices = [{"deviceId": f"m{i}", "status": "idle"} for i in range(5)] + ["kaputt"]
+    session = FakeSession(responses={("GET", RealMammotionAPI.DEVICES_URL): FakeResponse(payload={"devices": devices})})
+    api = logged_in_api(session)
+    threads = []
+    original = api._parse_devices
+
+    def spy(body):
+        threads.append(threading.current_thread() is threading.main_thread())
+        return original(body)
+
+    api._parse_devices = spy
+    assert [m.device_id for m in run(api.discover_devices())] == [f"m{i}" for i in range(5)]
+    monkeypatch.setattr(RealMammotionAPI, "PARSE_IN_THREAD_BYTES", 10)
+    assert len(run(api.discover_devices())) == 5
+    assert threads == [True, False]
+    assert sorted(api._devices) == [f"m{i}" for i in range(5)]
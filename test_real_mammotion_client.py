@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Tests für den RealMammotionClient
+
+Es werden keine echten Mammotion-Server kontaktiert.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Füge src-Verzeichnis zum Python-Pfad hinzu
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from models import real_mammotion_client as client_module
+from models.real_mammotion_client import RealMammotionClient
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class FakeResponse:
+    def __init__(self, status=200, payload=None):
+        self.status = status
+        self.payload = payload or {}
+
+    async def json(self):
+        return self.payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Zeichnet Requests auf und liefert feste Antworten je URL-Endung"""
+
+    def __init__(self, routes=None):
+        self.routes = routes or {}
+        self.requests = []
+        self.closed = False
+
+    def _respond(self, method, url, headers=None, **kwargs):
+        self.requests.append((method, url, dict(headers or {})))
+        for suffix, response in self.routes.items():
+            if url.endswith(suffix):
+                return response(url) if callable(response) else response
+        return FakeResponse(404)
+
+    def get(self, url, **kwargs):
+        return self._respond("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._respond("POST", url, **kwargs)
+
+    async def close(self):
+        self.closed = True
+
+
+def http_client(session, token="tok"):
+    """Client mit HTTP-Anmeldung (ohne PyMammotion)"""
+    session.routes["/auth"] = FakeResponse(payload={"success": True, "access_token": token})
+    client = RealMammotionClient(session=session)
+    assert run(client._authenticate_with_http("user@example.com", "secret"))
+    return client
+
+
+# --- HTTP-Session --------------------------------------------------------------
+
+def test_clients_share_one_pooled_session():
+    async def scenario():
+        first, second = RealMammotionClient(), RealMammotionClient()
+        await first._ensure_session()
+        await second._ensure_session()
+        session = first._session
+        assert second._session is session
+        assert session.connector.limit == client_module.POOL_LIMIT
+        assert session.connector.limit_per_host == client_module.POOL_LIMIT_PER_HOST
+        # close() eines Clients lässt die gemeinsame Session offen
+        await first.close()
+        assert not session.closed
+        await client_module.close_shared_session()
+        assert session.closed
+
+    run(scenario())
+
+
+def test_session_of_a_previous_loop_is_closed_when_replaced():
+    async def shared():
+        return client_module.get_shared_session()
+
+    async def replace():
+        session = client_module.get_shared_session()
+        await asyncio.sleep(0)
+        return session
+
+    old = run(shared())
+    assert not old.closed
+    new = run(replace())
+    assert new is not old
+    assert old.closed
+    run(client_module.close_shared_session())
+    assert new.closed
+
+
+def test_injected_session_is_not_closed():
+    session = FakeSession()
+    client = RealMammotionClient(session=session)
+    run(client.close())
+    assert not session.closed
+
+
+def test_authorization_header_is_per_client():
+    session = FakeSession({"/devices": FakeResponse(payload={"devices": []})})
+    first = http_client(session, token="a")
+    second = http_client(session, token="b")
+
+    run(first._discover_with_http())
+    run(second._discover_with_http())
+
+    headers = [h for method, url, h in session.requests if url.endswith("/devices")]
+    assert headers == [{"Authorization": "Bearer a"}, {"Authorization": "Bearer b"}]
+
+
+# --- Token-Cache -----------------------------------------------------------------
+
+class FakeTokenStore:
+    def __init__(self, tokens=None):
+        self.tokens = dict(tokens or {})
+
+    def set_token(self, username, token):
+        self.tokens[username] = token
+
+    def get_token(self, username):
+        return self.tokens.get(username)
+
+    def delete_token(self, username):
+        self.tokens.pop(username, None)
+
+
+def cached(token, expires_at):
+    return json.dumps({"access_token": token, "expires_at": expires_at, "refresh_token": None})
+
+
+def test_login_stores_token_with_expiry():
+    store = FakeTokenStore()
+    session = FakeSession({"/auth": FakeResponse(payload={"success": True, "access_token": "tok", "expires_in": 3600})})
+    client = RealMammotionClient(session=session, token_store=store)
+
+    assert run(client.authenticate("user@example.com", "secret"))
+
+    entry = json.loads(store.tokens["user@example.com"])
+    assert entry["access_token"] == "tok"
+    assert entry["expires_at"] > time.time() + 3000
+    assert "secret" not in store.tokens["user@example.com"]
+
+
+def test_valid_cached_token_skips_password_login():
+    store = FakeTokenStore({"user@example.com": cached("tok", time.time() + 3600)})
+    session = FakeSession({"/devices": FakeResponse(payload={"devices": []})})
+    client = RealMammotionClient(session=session, token_store=store)
+
+    assert run(client.authenticate("user@example.com", "secret"))
+
+    assert client.is_authenticated
+    assert [(m, u.rsplit("/", 1)[-1]) for m, u, h in session.requests] == [("GET", "devices")]
+    assert session.requests[0][2] == {"Authorization": "Bearer tok"}
+
+
+def test_expired_or_rejected_token_falls_back_to_login():
+    session = FakeSession({
+        "/devices": FakeResponse(401),
+        "/auth": FakeResponse(payload={"success": True, "access_token": "neu"}),
+    })
+    # Abgelaufen: keine Prüfanfrage, direkt Passwort-Login
+    store = FakeTokenStore({"user@example.com": cached("alt", time.time() - 1)})
+    assert run(RealMammotionClient(session=session, token_store=store).authenticate("user@example.com", "pw"))
+    assert [u.rsplit("/", 1)[-1] for _, u, _ in session.requests] == ["auth"]
+
+    # Vom Server abgelehnt: Token verwerfen, dann Passwort-Login
+    session.requests.clear()
+    store.tokens["user@example.com"] = cached("alt", None)
+    assert run(RealMammotionClient(session=session, token_store=store).authenticate("user@example.com", "pw"))
+    assert [u.rsplit("/", 1)[-1] for _, u, _ in session.requests] == ["devices", "auth"]
+    assert json.loads(store.tokens["user@example.com"])["access_token"] == "neu"
+
+
+def test_unauthorized_response_invalidates_cached_token():
+    store = FakeTokenStore()
+    session = FakeSession({"/status": FakeResponse(401)})
+    session.routes["/auth"] = FakeResponse(payload={"success": True, "access_token": "tok"})
+    client = RealMammotionClient(session=session, token_store=store)
+    assert run(client.authenticate("user@example.com", "pw"))
+
+    assert run(client.get_device_status("m1")) is None
+
+    assert not client.is_authenticated
+    assert store.tokens == {}
+
+
+# --- Status-Abfragen -------------------------------------------------------------
+
+def test_all_device_statuses_are_fetched_concurrently_and_bounded(monkeypatch):
+    state = {"active": 0, "peak": 0}
+
+    class SlowResponse(FakeResponse):
+        async def __aenter__(self):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return self
+
+    def status(url):
+        device_id = url.rsplit("/", 2)[-2]
+        if device_id == "kaputt":
+            return FakeResponse(500)
+        return SlowResponse(payload={"name": device_id, "battery_level": 50})
+
+    session = FakeSession({"/status": status})
+    client = http_client(session)
+    monkeypatch.setattr(RealMammotionClient, "STATUS_CONCURRENCY", 3)
+    ids = [f"m{i}" for i in range(8)] + ["kaputt"]
+
+    results = run(client.get_all_device_statuses(ids))
+
+    assert [r.name if r else None for r in results] == ids[:-1] + [None]
+    assert 1 < state["peak"] <= 3
+
+
+def test_all_device_statuses_default_to_discovered_devices():
+    session = FakeSession({
+        "/devices": FakeResponse(payload={"devices": [{"id": "a"}, {"id": "b"}]}),
+        "/status": lambda url: FakeResponse(payload={"status": "mowing"}),
+    })
+    client = http_client(session)
+    run(client._discover_with_http())
+
+    results = run(client.get_all_device_statuses())
+
+    assert [(r.device_id, r.status) for r in results] == [("a", "mowing"), ("b", "mowing")]
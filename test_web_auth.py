@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests für Authentifizierung und geschützte Routen der Web-App
+
+Der MammotionService wird durch einen Fake ersetzt, es werden keine echten
+Mammotion-Server kontaktiert.
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+# Füge src-Verzeichnis zum Python-Pfad hinzu
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from fastapi.testclient import TestClient
+
+from mammotion_web.app import create_app
+from mammotion_web.routers import auth_router
+from mammotion_web.services import mammotion_service
+
+
+class FakeService:
+    """Ersetzt MammotionService.login/logout für die Tests"""
+
+    def __init__(self, result="sid-1"):
+        self.result = result
+        self.logged_out = []
+
+    async def login(self, email, password):
+        if isinstance(self.result, BaseException):
+            raise self.result
+        return self.result
+
+    async def logout(self, session):
+        self.logged_out.append(session)
+
+
+@pytest.fixture
+def fake_service(monkeypatch):
+    service = FakeService()
+    monkeypatch.setattr(mammotion_service, "get_service", lambda: service)
+    monkeypatch.setattr(auth_router, "_login_attempts", {})
+    return service
+
+
+@pytest.fixture
+def client(fake_service):
+    return TestClient(create_app(), raise_server_exceptions=False)
+
+
+def login(client):
+    return client.post(
+        "/auth/login",
+        data={"username": "user@example.com", "password": "secret"},
+        follow_redirects=False,
+    )
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [("get", "/devices/abc"), ("post", "/devices/abc/start"), ("post", "/devices/abc/stop")],
+)
+def test_anonymous_device_api_is_rejected(client, method, path):
+    response = getattr(client, method)(path)
+    assert response.status_code == 401
+
+
+def test_anonymous_devices_page_redirects_to_login(client):
+    response = client.get("/devices/", follow_redirects=False)
+    assert response.status_code == 302
+    assert response.headers["location"] == "/auth/login"
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [("get", "/devices/abc"), ("post", "/devices/abc/start"), ("post", "/devices/abc/stop")],
+)
+def test_authenticated_device_api_is_allowed(client, method, path):
+    assert login(client).status_code == 302
+    response = getattr(client, method)(path)
+    assert response.status_code == 200
+    assert response.json()["device_id"] == "abc"
+
+
+def test_logout_releases_service_session(client, fake_service):
+    sid = asyncio.run(mammotion_service.create_session_for("user@example.com", client=None, manager=None))
+    fake_service.result = sid
+    assert login(client).status_code == 302
+
+    response = client.post("/auth/logout", follow_redirects=False)
+
+    assert response.status_code == 302
+    assert len(fake_service.logged_out) == 1
+    with pytest.raises(mammotion_service.AuthError):
+        asyncio.run(mammotion_service.resolve_session(sid))
+    assert client.get("/devices/abc").status_code == 401
+
+
+def test_login_page_renders(client):
+    response = client.get("/auth/login")
+    assert response.status_code == 200
+    assert 'action="/auth/login"' in response.text
+
+
+def test_login_success_redirects_to_dashboard(client):
+    response = login(client)
+    assert response.status_code == 302
+    assert response.headers["location"] == "/dashboard"
+
+
+def test_login_auth_error_returns_generic_401(client, fake_service):
+    fake_service.result = mammotion_service.AuthError("Region discovery failed: secret internals")
+    response = login(client)
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Invalid credentials"}
+
+
+def test_login_unexpected_error_returns_500(client, fake_service):
+    fake_service.result = RuntimeError("boom")
+    response = login(client)
+    assert response.status_code == 500
+    assert "boom" not in response.text
+
+
+def test_repeated_successful_logins_are_not_throttled(client):
+    for _ in range(auth_router.LOGIN_MAX_FAILURES + 2):
+        assert login(client).status_code == 302
+    assert auth_router._login_attempts == {}
+
+
+def test_failed_logins_are_throttled(client, fake_service):
+    fake_service.result = mammotion_service.AuthError("bad password")
+    for _ in range(auth_router.LOGIN_MAX_FAILURES):
+        assert login(client).status_code == 401
+    assert login(client).status_code == 429
+
+
+def test_failure_table_stays_bounded(monkeypatch):
+    monkeypatch.setattr(auth_router, "_login_attempts", {})
+    monkeypatch.setattr(auth_router, "LOGIN_MAX_TRACKED_CLIENTS", 3)
+    for i in range(10):
+        auth_router._record_login_failure(f"10.0.0.{i}")
+    assert len(auth_router._login_attempts) == 3
+    assert "10.0.0.9" in auth_router._login_attempts
+
+
+def test_expired_failures_are_forgotten(monkeypatch):
+    monkeypatch.setattr(auth_router, "_login_attempts", {})
+    auth_router._record_login_failure("10.0.0.1")
+    auth_router._login_attempts["10.0.0.1"][0] -= auth_router.LOGIN_WINDOW_SECONDS + 1
+    auth_router._check_login_rate("10.0.0.1")
+    assert "10.0.0.1" not in auth_router._login_attempts
+
+
+def test_json_endpoints_use_orjson_response(client):
+    from mammotion_web.app import ORJSONResponse
+
+    assert client.app.router.default_response_class is ORJSONResponse
+    response = client.get("/healthz")
+    assert response.json() == {"status": "ok"}
+
+
+def test_setup_logging_writes_through_background_listener(monkeypatch, capsys):
+    from mammotion_web.logging_conf import setup_logging
+
+    monkeypatch.setattr(logging.root, "handlers", [])
+    monkeypatch.setattr(logging.root, "level", logging.root.level)
+    listener = setup_logging("INFO")
+    assert listener is not None
+    try:
+        logging.getLogger("mammotion_web.test").info("hallo %s", "welt")
+    finally:
+        # stop() verarbeitet noch ausstehende Einträge
+        listener.stop()
+    assert "mammotion_web.test - INFO - hallo welt" in capsys.readouterr().out
+    # Bereits konfigurierter Root-Logger bleibt unverändert
+    assert setup_logging("INFO") is None
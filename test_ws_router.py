@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests für den WebSocket-Router (Outbox pro Verbindung)
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Füge src-Verzeichnis zum Python-Pfad hinzu
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from fastapi.testclient import TestClient
+
+from mammotion_web.app import create_app
+from mammotion_web.routers.ws_router import ConnectionManager
+
+
+class FakeWebSocket:
+    """Sammelt gesendete Nachrichten"""
+
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("connection lost")
+        self.sent.append(json.loads(text))
+
+
+def test_echo_roundtrip():
+    client = TestClient(create_app())
+    with client.websocket_connect("/ws") as ws:
+        ws.send_text(json.dumps({"hello": "world"}))
+        assert ws.receive_json() == {"type": "echo", "data": {"hello": "world"}}
+
+
+def test_broadcast_coalesces_status_per_device():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        # Writer has not run yet, so all of these land in one batch
+        await manager.broadcast({"type": "device_status", "device_id": "a", "status": 1})
+        await manager.broadcast({"type": "device_status", "device_id": "b", "status": 1})
+        await manager.broadcast({"type": "command_result", "ok": True})
+        await manager.broadcast({"type": "command_result", "ok": False})
+        await manager.broadcast({"type": "device_status", "device_id": "a", "status": 2})
+        await asyncio.sleep(0.01)
+        manager.disconnect(ws)
+        return ws.sent
+
+    sent = asyncio.run(scenario())
+    assert sent == [
+        {"type": "device_status", "device_id": "b", "status": 1},
+        {"type": "command_result", "ok": True},
+        {"type": "command_result", "ok": False},
+        {"type": "device_status", "device_id": "a", "status": 2},
+    ]
+
+
+def test_failed_send_drops_connection():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = FakeWebSocket(fail=True)
+        await manager.connect(ws)
+        await manager.broadcast({"type": "device_list", "devices": []})
+        await asyncio.sleep(0.01)
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert manager.active_connections == {}
+    assert manager._writers == {}